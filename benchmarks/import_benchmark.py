@@ -0,0 +1,57 @@
+import argparse
+import subprocess
+import sys
+
+# cold import time of the package entry points, each measured in a fresh
+# interpreter; budgets are in milliseconds and exclude flet's own import time
+BUDGETS_MS = {
+    "datepicker": 5,
+    "datepicker.engine": 15,
+    "datepicker.datepicker": 40,
+}
+
+# flet is preloaded for the control module so only the package own cost is timed
+PRELOAD = {
+    "datepicker.datepicker": "import flet",
+}
+
+PROBE = """
+import sys, time
+{preload}
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000, "flet" in sys.modules)
+"""
+
+
+def measure(module, repeat):
+    best = None
+    loads_flet = False
+    preload = PRELOAD.get(module, "")
+    code = PROBE.format(module=module, preload=preload)
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+        best = float(out[0]) if best is None else min(best, float(out[0]))
+        loads_flet = out[1] == "True" and not preload
+    return best, loads_flet
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="datepicker import time budget")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module, budget in BUDGETS_MS.items():
+        ms, loads_flet = measure(module, args.repeat)
+        status = "ok" if ms <= budget else "OVER BUDGET"
+        if loads_flet:
+            status = "IMPORTS FLET"
+        if status != "ok":
+            failures += 1
+        print(f"{module:25} {ms:8.2f} ms  budget {budget:4} ms  {status}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
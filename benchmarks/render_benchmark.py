@@ -0,0 +1,217 @@
+import argparse
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import flet as ft
+from flet_core.control import Control
+from flet_core.protocol import CommandEncoder
+
+from datepicker.datepicker import DatePicker
+from datepicker.selection_type import SelectionType
+
+# headless render benchmark: the picker is mounted on a stub page that builds
+# the same update commands a real page would send, without a Flet client
+
+YEAR = 2023
+MONTH = 5
+
+
+class StubPage:
+
+    def __init__(self):
+        self.index = {}
+        self.last_commands = []
+        self.last_added = []
+        self._next_id = 0
+
+    def mount(self, control):
+        added = []
+        self.last_commands = control._build_add_commands(index=self.index, added_controls=added)
+        self._register(added)
+        control.page = self
+        self.last_added = added
+
+    def update(self, *controls):
+        commands, added, removed = [], [], []
+        for control in controls:
+            control.build_update_commands(self.index, commands, added, removed)
+        self._register(added)
+        self.last_commands = commands
+        self.last_added = added
+
+    def _register(self, controls):
+        for control in controls:
+            self._next_id += 1
+            control._Control__uid = f"_{self._next_id}"
+            control.page = self
+            self.index[control.uid] = control
+
+
+class ControlCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    @contextlib.contextmanager
+    def counting(self):
+        original = Control.__init__
+        counter = self
+
+        def init(self, *args, **kwargs):
+            counter.count += 1
+            original(self, *args, **kwargs)
+
+        Control.__init__ = init
+        try:
+            yield self
+        finally:
+            Control.__init__ = original
+
+
+def fake_event(control, data=None):
+    return ft.ControlEvent(target=control.uid if isinstance(control, Control) else "", name="click", data=data, control=control, page=None)
+
+
+def button(data):
+    return ft.IconButton(data=data)
+
+
+def day_cell(picker, offset=10):
+    return picker.month_views[len(picker.month_views) // 2].cells[offset]
+
+
+def configurations():
+    holidays = [datetime(2000, 1, 1) + timedelta(days=3 * i) for i in range(5000)]
+    selected = [datetime(YEAR, 1, 1) + timedelta(days=i) for i in range(0, 3000, 2)]
+    return {
+        "single_month": dict(),
+        "three_months": dict(show_three_months=True),
+        "hour_minute": dict(hour_minute=True),
+        "range": dict(selection_type=SelectionType.RANGE),
+        "large_holidays": dict(holidays=holidays),
+        "large_multiple": dict(selection_type=SelectionType.MULTIPLE, selected_date=selected),
+        "large_multiple_three_months": dict(selection_type=SelectionType.MULTIPLE, selected_date=selected, show_three_months=True),
+        "scroll_24_months": dict(scroll_months=24),
+    }
+
+
+def interactions(options):
+    # the buttons are created here, outside the measured actions
+    next_month = button(DatePicker.NEXT_MONTH)
+    prev_month = button(DatePicker.PREV_MONTH)
+    next_year = button(DatePicker.NEXT_YEAR)
+    next_minute = button(DatePicker.NEXT_MINUTE)
+    steps = [
+        ("select_date", lambda p: p._select_date(fake_event(day_cell(p, 10)))),
+        ("select_other_date", lambda p: p._select_date(fake_event(day_cell(p, 16)))),
+        ("next_month", lambda p: p._adjust_calendar(fake_event(next_month))),
+        ("prev_month", lambda p: p._adjust_calendar(fake_event(prev_month))),
+        ("next_year", lambda p: p._adjust_calendar(fake_event(next_year))),
+        ("update_calendar", lambda p: p._update_calendar()),
+    ]
+    if options.get("hour_minute"):
+        steps.append(("next_minute", lambda p: p._adjust_hh_min(fake_event(next_minute))))
+    return steps
+
+
+def measure(page, action, instrumented):
+    if not instrumented:
+        start = time.perf_counter()
+        action()
+        return {"time_ms": (time.perf_counter() - start) * 1000}
+
+    # allocations and control counts are measured in a separate pass, tracemalloc
+    # slows everything down and would dominate the timings
+    counter = ControlCounter()
+    tracemalloc.start()
+    with counter.counting():
+        action()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    payload = json.dumps(page.last_commands, cls=CommandEncoder, separators=(",", ":"))
+    return {
+        "controls_created": counter.count,
+        "controls_sent": len(page.last_added),
+        "peak_kb": peak / 1024,
+        "patch_bytes": len(payload),
+    }
+
+
+def run_pass(options, instrumented):
+    picker = DatePicker(**options)
+    picker.yy, picker.mm = YEAR, MONTH
+    page = StubPage()
+    steps = [("build", lambda p: page.mount(p))] + interactions(options)
+    return {name: measure(page, lambda: step(picker), instrumented) for name, step in steps}
+
+
+def run_configuration(options, repeat):
+    results = run_pass(options, True)
+    for _ in range(repeat):
+        # keep the fastest run, the other metrics are deterministic
+        for name, r in run_pass(options, False).items():
+            best = results[name].get("time_ms")
+            results[name]["time_ms"] = r["time_ms"] if best is None else min(best, r["time_ms"])
+    return results
+
+
+def check_baseline(report, baseline, tolerance):
+    failures = []
+    for config, steps in baseline.items():
+        for step, expected in steps.items():
+            actual = report.get(config, {}).get(step)
+            if actual is None:
+                continue
+            for metric in ("patch_bytes", "controls_created", "controls_sent"):
+                if actual[metric] > expected[metric] * (1 + tolerance):
+                    failures.append(f"{config}.{step}.{metric}: {actual[metric]} > {expected[metric]}")
+    return failures
+
+
+def print_report(report):
+    print(f"{'configuration':30} {'interaction':18} {'time ms':>9} {'created':>8} {'sent':>6} {'peak KB':>9} {'patch B':>9}")
+    for config, steps in report.items():
+        for step, r in steps.items():
+            # no timings with --repeat 0
+            time_ms = f"{r['time_ms']:9.2f}" if "time_ms" in r else f"{'-':>9}"
+            print(f"{config:30} {step:18} {time_ms} {r['controls_created']:8} {r['controls_sent']:6} {r['peak_kb']:9.1f} {r['patch_bytes']:9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DatePicker headless render benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per configuration, 0 for the counts only")
+    parser.add_argument("--config", action="append", help="run only the given configuration(s)")
+    parser.add_argument("--json", help="write the report to a json file")
+    parser.add_argument("--baseline", help="fail if patch size or control counts grow over a previous json report")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    configs = configurations()
+    report = {}
+    for name, options in configs.items():
+        if args.config and name not in args.config:
+            continue
+        report[name] = run_configuration(options, args.repeat)
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = check_baseline(report, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import importlib
+
+# public names are resolved on first access, so importing the package (or the
+# flet-free engine) does not pull in flet, calendar or locale
+_exports = {
+    "DatePicker": "datepicker.datepicker",
+    "DatePickerPool": "datepicker.pool",
+    "DateField": "datepicker.date_field",
+    "DateFormat": "datepicker.formats",
+    "get_format": "datepicker.formats",
+    "SelectionType": "datepicker.selection_type",
+    "CalendarEngine": "datepicker.engine",
+    "HolidayCalendar": "datepicker.holidays",
+    "LocaleNames": "datepicker.locale_names",
+    "get_locale_names": "datepicker.locale_names",
+    "Rule": "datepicker.rules",
+    "Weekdays": "datepicker.rules",
+    "Weekends": "datepicker.rules",
+    "NthWeekday": "datepicker.rules",
+    "Dates": "datepicker.rules",
+    "Before": "datepicker.rules",
+    "After": "datepicker.rules",
+    "HourWindow": "datepicker.rules",
+    "Only": "datepicker.rules",
+    "DayDecorator": "datepicker.decorators",
+    "DayValues": "datepicker.decorators",
+    "AvailabilityProvider": "datepicker.availability",
+    "StaticAvailabilityProvider": "datepicker.availability",
+    "AvailabilityCache": "datepicker.availability",
+    "StateStore": "datepicker.state",
+    "MetricsCollector": "datepicker.metrics",
+    "InMemoryMetrics": "datepicker.metrics",
+    "LoggingMetrics": "datepicker.metrics",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
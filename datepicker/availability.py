@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import OrderedDict
+
+from datepicker.selection import day_key
+
+# availability providers are queried in the background on a dedicated event
+# loop thread, so navigation never waits on I/O: a month without data is shown
+# as available and re-rendered when its data arrives. asyncio is imported on
+# the first fetch and logging on the first failure, the engine imports this module
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    global _loop
+    import asyncio
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="datepicker-availability", daemon=True).start()
+        return _loop
+
+
+class AvailabilityProvider:
+
+    # returns the unavailable days of the month
+    async def fetch(self, year: int, month: int):
+        raise NotImplementedError
+
+
+class StaticAvailabilityProvider(AvailabilityProvider):
+
+    # a local stub: unavailable days come from an iterable of dates or from a
+    # callable(year, month), optionally after a simulated latency
+    def __init__(self, unavailable=None, delay: float = 0):
+        self.unavailable = unavailable if callable(unavailable) else frozenset(day_key(d) for d in unavailable or [])
+        self.delay = delay
+        self.calls = 0
+
+    async def fetch(self, year: int, month: int):
+        self.calls += 1
+        if self.delay:
+            import asyncio
+            await asyncio.sleep(self.delay)
+        if callable(self.unavailable):
+            return self.unavailable(year, month)
+        return [d for d in self.unavailable if d.year == year and d.month == month]
+
+
+class AvailabilityCache:
+
+    def __init__(self, provider: AvailabilityProvider, ttl: float = 300, maxsize: int = 24, on_loaded: callable = None):
+        self.provider = provider
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = 0
+        self._versions = {}
+        self._listeners = [on_loaded] if on_loaded else []
+        self._entries = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: callable):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: callable):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # returns the cached unavailable days (stale data is returned while it is
+    # refreshed) or None, starting a background fetch when needed
+    def get(self, year: int, month: int):
+        key = (year, month)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                days, loaded_at = entry
+                if time.monotonic() - loaded_at < self.ttl:
+                    return days
+        self.prefetch(year, month)
+        return entry[0] if entry else None
+
+    def prefetch(self, year: int, month: int):
+        key = (year, month)
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and time.monotonic() - entry[1] < self.ttl
+            if fresh or key in self._pending:
+                return
+            self._pending.add(key)
+        import asyncio
+        asyncio.run_coroutine_threadsafe(self._load(year, month), _background_loop())
+
+    def is_unavailable(self, value) -> bool:
+        d = day_key(value)
+        with self._lock:
+            entry = self._entries.get((d.year, d.month))
+        return entry is not None and d in entry[0]
+
+    def mask(self, days) -> int:
+        mask = 0
+        for i, d in enumerate(days):
+            if self.is_unavailable(d):
+                mask |= 1 << i
+        return mask
+
+    # bumped whenever the data of that month changes, so the month models of
+    # the other months stay cached when a month is loaded
+    def month_version(self, year: int, month: int) -> int:
+        return self._versions.get((year, month), 0)
+
+    def invalidate(self, year: int = None, month: int = None):
+        with self._lock:
+            if year is None:
+                self._entries.clear()
+                for key in self._versions:
+                    self._versions[key] += 1
+            else:
+                self._entries.pop((year, month), None)
+                self._bump((year, month))
+            self.version += 1
+
+    def _bump(self, key):
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    async def _load(self, year, month):
+        key = (year, month)
+        try:
+            days = frozenset(day_key(d) for d in await self.provider.fetch(year, month))
+        except Exception:
+            from datepicker.metrics import logger
+            logger.warning("availability fetch failed for %s-%s", year, month, exc_info=True)
+            with self._lock:
+                self._pending.discard(key)
+            return
+
+        with self._lock:
+            self._pending.discard(key)
+            previous = self._entries.get(key)
+            self._entries[key] = (days, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._bump(self._entries.popitem(last=False)[0])
+            changed = previous is None or previous[0] != days
+            if changed:
+                self._bump(key)
+                self.version += 1
+
+        if changed:
+            for listener in list(self._listeners):
+                try:
+                    listener(year, month)
+                except Exception:
+                    from datepicker.metrics import logger
+                    logger.warning("availability listener failed", exc_info=True)
@@ -0,0 +1,59 @@
+import threading
+
+# selection changes are recorded as they happen (O(1) per added/removed value)
+# and delivered as deltas, so handlers never have to diff the whole selection
+
+
+class ChangeBatch:
+
+    # on_flush delivers the recorded changes, it is called before the selection
+    # they belong to is replaced
+    def __init__(self, on_flush: callable = None):
+        self.added = {}
+        self.removed = {}
+        self.on_flush = on_flush
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+    def add(self, key, value):
+        with self._lock:
+            # a value removed and added back in the same batch is no change
+            if self.removed.get(key) == value:
+                del self.removed[key]
+            else:
+                self.added[key] = value
+
+    def remove(self, key, value):
+        with self._lock:
+            if key in self.added:
+                del self.added[key]
+            else:
+                self.removed[key] = value
+
+    def take(self):
+        with self._lock:
+            added, removed = self.added, self.removed
+            self.added, self.removed = {}, {}
+        return added, removed
+
+    def flush(self):
+        if self and self.on_flush:
+            self.on_flush()
+
+
+class SelectionChange:
+
+    __slots__ = ("added", "removed", "selected")
+
+    # added/removed hold the values changed since the previous event, sorted by
+    # day; selected is an immutable snapshot of the whole selection with those
+    # changes applied, copied when the event is emitted
+    def __init__(self, added, removed, selected):
+        self.added = tuple(added[k] for k in sorted(added))
+        self.removed = tuple(removed[k] for k in sorted(removed))
+        self.selected = tuple(selected)
+
+    def __repr__(self):
+        return f"SelectionChange(added={self.added!r}, removed={self.removed!r})"
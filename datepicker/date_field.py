@@ -0,0 +1,177 @@
+from datetime import datetime
+
+import flet as ft
+
+from datepicker.datepicker import DatePicker
+from datepicker.formats import DateFormat, get_format
+from datepicker.locale_names import get_locale_names
+
+
+class DateField(ft.UserControl):
+
+    INVALID = "Invalid date"
+    DISABLED = "Date not available"
+    HOLIDAY = "Holiday"
+
+    def __init__(self,
+            picker: DatePicker = None,
+            pattern: str = None,
+            locale: str = None,
+            value: datetime = None,
+            label: str = None,
+            width: int = 260,
+            allow_holidays: bool = True,
+            on_change: callable = None
+        ):
+        super().__init__()
+        self.picker = None
+        self._previous_handler = None
+        self._pattern = pattern
+        self._locale = locale
+        self._format = None
+        self.allow_holidays = allow_holidays
+        self.on_change = on_change
+        self.value = value
+        self.text_field = ft.TextField(
+            label=label,
+            dense=True,
+            width=width,
+            height=40,
+            on_change=self._on_text_change,
+            on_submit=self._on_text_submit,
+            on_focus=self._on_text_focus,
+            on_blur=self._on_text_submit
+        )
+        if picker:
+            self.bind(picker)
+
+    def build(self):
+        self.text_field.hint_text = self.format.hint
+        if self.value is not None:
+            self.text_field.value = self.format.format(self.value)
+        return self.text_field
+
+    # the compiled pattern, from the picker locale unless given
+    @property
+    def format(self) -> DateFormat:
+        if self._format is None:
+            if self.picker and self._locale is None:
+                names = self.picker.locale_names
+            else:
+                names = get_locale_names(self._locale)
+            hour_minute = bool(self.picker and self.picker.hour_minute)
+            self._format = get_format(self._pattern, names, hour_minute)
+        return self._format
+
+    def bind(self, picker: DatePicker):
+        # picker -> field through the picker selection change events, the
+        # handler already set on the picker keeps being called
+        if self.picker is picker and picker.on_select_change == self._on_picker_change:
+            return
+        self.unbind()
+        self.picker = picker
+        self._format = None
+        self._previous_handler = picker.on_select_change
+        picker.reconfigure(on_select_change=self._on_picker_change)
+        if self.page:
+            # the picker locale and hour_minute may change the pattern
+            self.text_field.hint_text = self.format.hint
+            if self.value is not None:
+                self.text_field.value = self.format.format(self.value)
+            self.text_field.update()
+
+    def unbind(self):
+        if self._bound_picker() is None:
+            return
+        self.picker.reconfigure(on_select_change=self._previous_handler)
+        self.picker.editing = False
+        self.picker = None
+        self._previous_handler = None
+        self._format = None
+
+    # the picker may have moved on to another field, e.g. released to a
+    # DatePickerPool and acquired again: the binding is dropped then, so this
+    # field no longer drives it
+    def _bound_picker(self) -> DatePicker | None:
+        if self.picker is not None and self.picker.on_select_change != self._on_picker_change:
+            self.picker = None
+            self._previous_handler = None
+        return self.picker
+
+    def validate(self, value) -> str | None:
+        # checked on the engine month models, the picker grid is not rendered
+        if value is None:
+            return self.INVALID
+        if self._bound_picker() is None:
+            return None
+        engine = self.picker.engine
+        if engine.is_disabled(value):
+            return self.DISABLED
+        if not self.allow_holidays and value in engine.holidays:
+            return self.HOLIDAY
+        return None
+
+    def _on_text_change(self, e: ft.ControlEvent):
+        # errors are cleared while typing and shown again on submit
+        if self.text_field.error_text:
+            self.text_field.error_text = None
+            self.text_field.update()
+
+    def _on_text_focus(self, e: ft.ControlEvent):
+        # the bound picker ignores the keyboard while the date is typed
+        if self._bound_picker() is not None:
+            self.picker.editing = True
+
+    def _on_text_submit(self, e: ft.ControlEvent):
+        if e is not None and e.name == "blur" and self._bound_picker() is not None:
+            self.picker.editing = False
+        text = self.text_field.value
+        if not text:
+            self._set_value(None)
+            return
+        value = self.format.parse(text)
+        error = self.validate(value)
+        if error != self.text_field.error_text:
+            self.text_field.error_text = error
+            self.text_field.update()
+        if error is None:
+            self._set_value(value)
+
+    def _set_value(self, value):
+        if value == self.value:
+            return
+        self.value = value
+        if self._bound_picker() is not None:
+            self._sync_picker(value)
+        if self.on_change:
+            self.on_change(value)
+
+    def _sync_picker(self, value):
+        picker = self.picker
+        engine = picker.engine
+        if value is None:
+            engine.set_selection(keep=False)
+        else:
+            if engine.hour_minute:
+                engine.set_time(value.hour, value.minute)
+            engine.set_selection(selected_date=[value])
+        if not picker.month_views:
+            return
+        # the grid is re-rendered only when the value moves to another month,
+        # otherwise only the cells whose selection changed are patched
+        if value is not None and (value.year, value.month) != (picker.yy, picker.mm):
+            picker.jump_to(value.year, value.month)
+        else:
+            picker.refresh()
+
+    def _on_picker_change(self, change):
+        selected = change.added[-1] if change.added else (change.selected[0] if change.selected else None)
+        self.value = selected
+        self.text_field.value = self.format.format(selected) if selected else None
+        self.text_field.error_text = None
+        if self.page:
+            self.text_field.update()
+        if self.on_change:
+            self.on_change(selected)
+        if self._previous_handler:
+            self._previous_handler(change)
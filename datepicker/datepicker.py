@@ -1,16 +1,82 @@
-import locale as loc
-from typing import List
+import inspect
+from typing import Callable, List
 import flet as ft 
-import calendar
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, tzinfo
 
+from datepicker.availability import AvailabilityCache, AvailabilityProvider
+from datepicker.changes import ChangeBatch, SelectionChange
+from datepicker.decorators import DayDecorator, merge_annotations
+from datepicker.engine import FOCUSED, HIDDEN, IN_RANGE, MAIN_MONTH, SELECTED, TODAY, CalendarEngine
+from datepicker.holidays import HolidayCalendar
+from datepicker.locale_names import LocaleNames, get_locale_names
+from datepicker.metrics import MetricsCollector, as_collector, count_controls, logger, timed
+from datepicker.month_model import DISABLED, HOLIDAY, WEEKEND
+from datepicker.rules import Rule
+from datepicker.scheduler import UpdateScheduler
 from datepicker.selection_type import SelectionType
+from datepicker.styles import day_style, label_style
+
+class _MonthView:
+
+    def __init__(self):
+        self.year = None
+        self.month = None
+        self.main_month = None
+        self.days = ()
+        self.year_text = None
+        self.month_text = None
+        self.week_rows = []
+        self.cells = []
+        self.cell_keys = []
+        # day and badge texts of the cells of a decorated grid
+        self.day_texts = []
+        self.badges = []
+        self.labels = []
+        # slot position in the scrollable months list, see DatePicker.scroll_months
+        self.index = None
+        self.container = None
+
+
+def _engine_attr(name):
+    return property(
+        lambda self: getattr(self.engine, name),
+        lambda self, value: setattr(self.engine, name, value)
+    )
+
 
 class DatePicker(ft.UserControl):
 
     @property
     def selected_data(self):
         return self.selected
+
+    # calendar state lives in the headless engine
+    # assigning the selection or its type replaces the engine selection the
+    # same way reconfigure does, a built picker is re-rendered
+    selected = property(
+        lambda self: self.engine.selected,
+        lambda self, value: self.reconfigure(selected_date=list(value or ()))
+    )
+    selection = _engine_attr("selection")
+    selection_type = property(
+        lambda self: self.engine.selection_type,
+        lambda self, value: self.reconfigure(selection_type=value)
+    )
+    holidays = _engine_attr("holidays")
+    disable_to = _engine_attr("disable_to")
+    disable_from = _engine_attr("disable_from")
+    disabled_rules = _engine_attr("disabled_rules")
+    availability = _engine_attr("availability")
+    zone = property(lambda self: self.engine.zone)
+    first_weekday = _engine_attr("first_weekday")
+    hour_minute = _engine_attr("hour_minute")
+    hide_prev_next_month_days = _engine_attr("hide_prev_next_month_days")
+    now = _engine_attr("now")
+    yy = _engine_attr("yy")
+    mm = _engine_attr("mm")
+    hour = _engine_attr("hour")
+    minute = _engine_attr("minute")
     
     PREV_MONTH = "PM"
     NEXT_MONTH = "NM"
@@ -21,15 +87,32 @@ class DatePicker(ft.UserControl):
     NEXT_HOUR = "NH"
     PREV_MINUTE = "PMIN"
     NEXT_MINUTE  = "NMIN"
+    HOUR = "H"
+    MINUTE = "MIN"
+
+    KEY_SELECT = "SEL"
+    # key label -> (days, months) to move the focus by
+    KEYS = {
+        "Arrow Left": (-1, 0),
+        "Arrow Right": (1, 0),
+        "Arrow Up": (-7, 0),
+        "Arrow Down": (7, 0),
+        "Page Up": (0, -1),
+        "Page Down": (0, 1),
+        "Enter": KEY_SELECT,
+        "Numpad Enter": KEY_SELECT,
+    }
+
+    YEAR_PICKER = "YP"
+    MONTH_PICKER = "MP"
+    PICKER_PREV = "PP"
+    PICKER_NEXT = "PN"
+    PICKER_CLOSE = "PC"
 
     EMPTY = ""
     WHITE_SPACE = " "
 
-    DELTA_YEAR_WEEK = 52
-    DELTA_HOUR = 1
-    DELTA_MINUTE = 1
-
-    WEEKEND_DAYS = [5, 6]
+    MAX_WEEKS = 6
 
     CELL_SIZE = 32
     LAYOUT_WIDTH = 340
@@ -38,153 +121,169 @@ class DatePicker(ft.UserControl):
     LAYOUT_DT_MIN_HEIGHT = 320
     LAYOUT_DT_MAX_HEIGHT = 360
 
+    REPEAT_INTERVAL = 0.1
+    REPEAT_RENDER_DELAY = 0.25
+
+    MONTH_EXTENT = 300
+    SCROLL_LAYOUT_HEIGHT = 420
+    SCROLL_LAYOUT_DT_HEIGHT = 470
+    SCROLL_VISIBLE_MONTHS = 2
+    SCROLL_BUFFER_MONTHS = 1
+    SCROLL_INTERVAL = 50
+
+    AVAILABILITY_RENDER_DELAY = 0.05
+
+    BADGE_SIZE = 8
+    DAY_TEXT_TOP = 7
+
+    PICKER_ROWS = 4
+    PICKER_COLUMNS = 3
+    PICKER_CELL_WIDTH = 80
+    DECADE = 10
+
     def __init__(self, 
             hour_minute: bool = False, 
             selected_date: List[datetime] | None = None,
             selection_type: SelectionType | int = SelectionType.SINGLE,
             disable_to: datetime = None, 
             disable_from: datetime = None,
-            holidays: List[datetime] = None,
+            holidays: List[datetime] | HolidayCalendar = None,
             hide_prev_next_month_days: bool = False,
             first_weekday: int = 0,
             show_three_months: bool = False,
-            locale: str = None,
-            on_change: callable = None
+            locale: str | LocaleNames = None,
+            on_change: callable = None,
+            multiple_ranges: bool = False,
+            scroll_months: int = 0,
+            metrics: MetricsCollector | Callable = None,
+            update_delay: float = 0,
+            disabled_rules: List[Rule] | Rule = None,
+            availability: AvailabilityProvider | AvailabilityCache = None,
+            keyboard: bool = False,
+            tz: str | tzinfo = None,
+            on_select_change: Callable[[SelectionChange], None] = None,
+            change_delay: float = 0,
+            decorators: List[DayDecorator] | DayDecorator = None
         ):
         super().__init__()
-        self.selected = selected_date if selected_date else []
-        print(selection_type)
-        self.selection_type = selection_type if not type(int) else SelectionType.from_value(selection_type)
-        self.hour_minute = hour_minute
-        self.disable_to = disable_to
-        self.disable_from  = disable_from
-        self.holidays = holidays
-        self.hide_prev_next_month_days = hide_prev_next_month_days
-        self.first_weekday = first_weekday
+        # the engine (current date, selection, rules) and the locale names are
+        # only created when first needed, usually by build()
+        self._engine = None
+        self._engine_options = dict(
+            selection_type=selection_type,
+            selected_date=selected_date,
+            disable_to=disable_to,
+            disable_from=disable_from,
+            holidays=holidays,
+            first_weekday=first_weekday,
+            hour_minute=hour_minute,
+            hide_prev_next_month_days=hide_prev_next_month_days,
+            multiple_ranges=multiple_ranges,
+            disabled_rules=disabled_rules,
+            availability=availability,
+            tz=tz
+        )
+        self._locale = locale
+        self._locale_names = locale if isinstance(locale, LocaleNames) else None
+        self.metrics = as_collector(metrics)
+        self.patched_cells = 0
+        self.month_views = []
+        self._scheduler = UpdateScheduler(self._render_update, update_delay)
+        self._repeat_stop = None
         self.show_three_months = show_three_months
-        if locale: loc.setlocale(loc.LC_ALL, locale)
-        self.on_change = on_change or (lambda x: None)
+        self.scroll_months = scroll_months
+        self.keyboard = keyboard
+        # keys are handled only while the picker is shown (mounted or acquired
+        # from a pool) and none of its text fields is being edited
+        self.active = False
+        self.editing = False
+        self.decorators = decorators
+        self.on_change = on_change
+        # opt-in delta events: the changes made within change_delay seconds of the
+        # first one are delivered together (0 delivers each change right away)
+        self.on_select_change = on_select_change
+        self._change_scheduler = UpdateScheduler(self._emit_selection_change, change_delay) if on_select_change else None
+
+    @property
+    def engine(self) -> CalendarEngine:
+        if self._engine is None:
+            self._engine = CalendarEngine(**self._engine_options)
+            self._engine_options = None
+            if self.on_select_change:
+                self._engine.changes = ChangeBatch(self.flush_changes)
+        return self._engine
+
+    @property
+    def locale_names(self) -> LocaleNames:
+        if self._locale_names is None:
+            self._locale_names = get_locale_names(self._locale)
+        return self._locale_names
 
-        self.now = datetime.now()
-        self.yy = self.now.year 
-        self.mm = self.now.month 
-        self.dd = self.now.day
-        self.hour = self.now.hour
-        self.minute = self.now.minute
-        self.cal = calendar.Calendar(first_weekday)
+    def did_mount(self):
+        self.active = True
+        self._listen(True)
 
-    def _on_change(self, e) -> None:
-        self.on_change(e)
+    def will_unmount(self):
+        self.active = False
+        self._listen(False)
 
-    def _get_current_month(self, year, month):
-        return self.cal.monthdatescalendar(year, month)
+    def _on_availability_loaded(self, year, month):
+        # called from the availability loop thread, which must not wait on the
+        # page: the render runs on a scheduler timer, and only when a shown grid
+        # has days of the loaded month (leading/trailing days included)
+        if self.page and any(
+            view.days and (view.days[0].year, view.days[0].month) <= (year, month) <= (view.days[-1].year, view.days[-1].month)
+            for view in self.month_views
+        ):
+            self._scheduler.request(self.AVAILABILITY_RENDER_DELAY)
+
+    def _on_decorator_changed(self):
+        if self.month_views:
+            self._update_calendar()
+
+    def _on_change(self) -> None:
+        # the full selection list is only built for the on_change callback
+        if self.on_change:
+            self.on_change(self.selected)
+        if self._change_scheduler:
+            self._change_scheduler.request()
+
+    def _emit_selection_change(self):
+        added, removed, selected = self.engine.take_changes()
+        if added or removed:
+            self.on_select_change(SelectionChange(added, removed, selected))
+
+    def flush_changes(self):
+        if self._change_scheduler:
+            self._change_scheduler.flush()
 
-    def _create_calendar(self, year, month, hour, minute, hide_ymhm = False):
+    def _create_calendar(self, year, month, hour, minute, hide_ymhm = False, main_month = None):
         
         week_rows_controls = []
         week_rows_days_controls = []
-        today = datetime.now()
 
-        days = self._get_current_month(year, month)
+        view = _MonthView()
 
-        ym = self._year_month_selectors(year, month, hide_ymhm)
+        ym = self._year_month_selectors(year, month, hide_ymhm, view)
         week_rows_controls.append(ft.Column([ym], alignment=ft.MainAxisAlignment.START))
         
-        labels = ft.Row(self._row_labels(), spacing=18)
+        view.labels = self._row_labels()
+        labels = ft.Row(view.labels, spacing=18)
         week_rows_controls.append(ft.Column([labels], alignment=ft.MainAxisAlignment.START))
 
-        weeks_rows_num = len(self._get_current_month(year, month))
-
-        for w in range(0, weeks_rows_num):
+        # the grid is created once with the max number of weeks a month can span,
+        # cells are then patched in place by _render_calendar
+        for w in range(0, self.MAX_WEEKS):
             row = []
-            
-            for d in days[w]:
-
-                d = datetime(d.year, d.month, d.day, self.hour, self.minute) if self.hour_minute else datetime(d.year, d.month, d.day)
+            for _ in range(0, 7):
+                cell = self._day_cell(view)
+                row.append(cell)
+                view.cells.append(cell)
+                view.cell_keys.append(None)
 
-                month = d.month
-                is_main_month = True if month == self.mm else False
-                
-                if self.hide_prev_next_month_days and not is_main_month:
-                    row.append(ft.Text("", width=self.CELL_SIZE, height=self.CELL_SIZE,))
-                    continue
-
-                dt_weekday = d.weekday()
-                day = d.day
-                is_weekend = False
-                is_holiday = False
-
-                is_day_disabled = False
-
-                if self.disable_from and self._trunc_datetime(d) > self._trunc_datetime(self.disable_from):
-                    is_day_disabled = True
-                
-                if self.disable_to and self._trunc_datetime(d) < self._trunc_datetime(self.disable_to):
-                    is_day_disabled = True
-                
-                text_color = None   
-                border_side = None 
-                bg = None
-                # week end bg color
-                if dt_weekday in self.WEEKEND_DAYS:
-                    text_color = ft.colors.RED_500
-                    is_weekend = True
-                # holidays
-                if self.holidays and d in self.holidays:
-                    text_color = ft.colors.RED_500
-                    is_holiday = True                    
-
-                # current day bg
-                if is_main_month and day == self.dd and self.dd == today.day and self.mm == today.month and self.yy == today.year:
-                    border_side = ft.BorderSide(2, ft.colors.BLUE)
-                elif (is_weekend or is_holiday) and (not is_main_month or is_day_disabled):
-                    text_color = ft.colors.RED_200
-                    bg = None
-                elif not is_main_month and is_day_disabled:
-                    text_color = ft.colors.BLACK38
-                    bg = None
-                elif not is_main_month:
-                    text_color = ft.colors.BLUE_200
-                    bg = None
-                else:
-                    bg = None
-
-                # selected days 
-                selected_numbers = len(self.selected)
-                if (self.selection_type != SelectionType.RANGE):
-                    if selected_numbers > 0 and d in self.selected:
-                        bg = ft.colors.BLUE_400
-                        text_color = ft.colors.WHITE 
-                else:
-                    if  selected_numbers > 0 and selected_numbers < 3 and d in self.selected:
-                        bg = ft.colors.BLUE_400
-                        text_color = ft.colors.WHITE
-
-                if self.selection_type == SelectionType.RANGE and selected_numbers > 1:
-                    if d > self.selected[0] and d < self.selected[-1]:
-                        bg = ft.colors.BLUE_300
-                        text_color = ft.colors.WHITE 
-                
-                row.append(
-                    ft.TextButton(
-                        text=str(day), 
-                        data=d, 
-                        width=self.CELL_SIZE,
-                        height=self.CELL_SIZE,
-                        disabled=is_day_disabled,
-                        style=ft.ButtonStyle(
-                            color=text_color,
-                            bgcolor=bg, 
-                            padding=0, 
-                            shape={
-                                ft.MaterialState.DEFAULT: ft.RoundedRectangleBorder(radius=20),
-                            },
-                            side=border_side
-                        ), 
-                    on_click=self._select_date) 
-                )
-            
-            week_rows_days_controls.append(ft.Row(row, spacing=18))
+            week_row = ft.Row(row, spacing=18)
+            view.week_rows.append(week_row)
+            week_rows_days_controls.append(week_row)
         
         week_rows_controls.append(ft.Column(week_rows_days_controls, alignment=ft.MainAxisAlignment.START, spacing=0))
 
@@ -192,22 +291,164 @@ class DatePicker(ft.UserControl):
             hm = self._hour_minute_selector(hour, minute)
             week_rows_controls.append(ft.Row([hm], alignment=ft.MainAxisAlignment.CENTER))
 
+        self._render_calendar(view, year, month, main_month)
+        self.month_views.append(view)
+
         return week_rows_controls
+
+    def _day_cell(self, view):
+        if not self._decorators:
+            return ft.TextButton(
+                text=self.EMPTY,
+                width=self.CELL_SIZE,
+                height=self.CELL_SIZE,
+                on_click=self._select_date
+            )
+        # with decorators the badge is shown in the top right corner of the cell
+        day_text = ft.Text(self.EMPTY, left=0, right=0, top=self.DAY_TEXT_TOP, text_align=ft.TextAlign.CENTER)
+        badge = ft.Text(self.EMPTY, size=self.BADGE_SIZE, weight=ft.FontWeight.BOLD, right=0, top=0, no_wrap=True)
+        view.day_texts.append(day_text)
+        view.badges.append(badge)
+        return ft.TextButton(
+            content=ft.Stack([day_text, badge], width=self.CELL_SIZE, height=self.CELL_SIZE),
+            width=self.CELL_SIZE,
+            height=self.CELL_SIZE,
+            on_click=self._select_date
+        )
+
+    def _render_calendar(self, view, year, month, main_month = None):
+
+        view.year = year
+        view.month = month
+        view.year_text.value = year
+        view.month_text.value = self.locale_names.month_names[month]
+
+        state = self.engine.month_state(year, month, main_month)
+        weeks_rows_num = state.weeks_number
+        view.main_month = state.main_month
+        view.days = state.days
+        annotations = self._annotations(state.days)
+
+        for w in range(0, self.MAX_WEEKS):
+            week_row = view.week_rows[w]
+            visible = w < weeks_rows_num
+            if week_row.visible != visible:
+                week_row.visible = visible
+            if not visible:
+                continue
+
+            for idx in range(w * 7, w * 7 + 7):
+                cell = view.cells[idx]
+                d = state.days[idx]
+                day_state = state.states[idx]
+                # data lives only on the python side, it never produces a patch
+                cell.data = None if day_state & HIDDEN else self.engine.cell_value(d)
+                key = self._day_cell_state(d, day_state, annotations[idx] if annotations else None)
+                if view.cell_keys[idx] == key:
+                    continue
+                view.cell_keys[idx] = key
+                self._patch_cell(view, idx, key)
+                self.patched_cells += 1
+
+    @property
+    def decorators(self):
+        return self._decorators
+
+    @decorators.setter
+    def decorators(self, value):
+        self._decorators = (value,) if isinstance(value, DayDecorator) else tuple(value or ())
+
+    def _annotations(self, days):
+        if not self._decorators:
+            return None
+        if len(self._decorators) == 1:
+            return self._decorators[0].annotate(days)
+        return merge_annotations([d.annotate(days) for d in self._decorators])
+
+    def _day_cell_state(self, d, state, annotation = None):
+
+        if state & HIDDEN:
+            return (self.EMPTY, True, None, None, False, None, False, None)
+
+        is_main_month = bool(state & MAIN_MONTH)
+        is_weekend = bool(state & WEEKEND)
+        is_holiday = bool(state & HOLIDAY)
+        is_day_disabled = bool(state & DISABLED)
+        tooltip = None
+        
+        text_color = None   
+        border_side = False 
+        bg = None
+        # week end bg color
+        if is_weekend:
+            text_color = ft.colors.RED_500
+        # holidays
+        if is_holiday:
+            text_color = ft.colors.RED_500
+            tooltip = self.holidays.label(d)
+
+        # current day bg
+        if state & TODAY:
+            border_side = True
+        elif (is_weekend or is_holiday) and (not is_main_month or is_day_disabled):
+            text_color = ft.colors.RED_200
+        elif not is_main_month and is_day_disabled:
+            text_color = ft.colors.BLACK38
+        elif not is_main_month:
+            text_color = ft.colors.BLUE_200
+
+        # selected days 
+        if state & SELECTED:
+            bg = ft.colors.BLUE_400
+            text_color = ft.colors.WHITE 
+        elif state & IN_RANGE:
+            bg = ft.colors.BLUE_300
+            text_color = ft.colors.WHITE 
+
+        # day decorators: heat color under the selection, badge in the cell corner
+        badge = None
+        if annotation:
+            color, badge = annotation
+            if bg is None:
+                bg = color
+
+        return (str(d.day), is_day_disabled, text_color, bg, border_side, tooltip, bool(state & FOCUSED), badge)
+
+    def _patch_cell(self, view, idx, key):
+        text, disabled, text_color, bg, border_side, tooltip, focused, badge = key
+        cell = view.cells[idx]
+        if view.badges:
+            view.day_texts[idx].value = text
+            view.badges[idx].value = badge
+        else:
+            cell.text = text
+        cell.tooltip = tooltip
+        cell.disabled = disabled
+        cell.style = day_style(text_color, bg, border_side, focused)
     
-    def _year_month_selectors(self, year, month, hide_ymhm = False):
+    def _year_month_selectors(self, year, month, hide_ymhm = False, view = None):
         prev_year = ft.IconButton(icon=ft.icons.ARROW_BACK_IOS_NEW, data=self.PREV_YEAR, on_click=self._adjust_calendar, icon_color=ft.colors.BLACK54) if not hide_ymhm else ft.Text(self.EMPTY, height=self.CELL_SIZE,)
         next_year = ft.IconButton(icon=ft.icons.ARROW_FORWARD_IOS, data=self.NEXT_YEAR, on_click=self._adjust_calendar, icon_color=ft.colors.BLACK54) if not hide_ymhm else ft.Text(self.EMPTY)
         prev_month = ft.IconButton(icon=ft.icons.ARROW_BACK_IOS_NEW, data=self.PREV_MONTH, on_click=self._adjust_calendar, icon_color=ft.colors.BLACK54) if not hide_ymhm else ft.Text(self.EMPTY)
         next_month = ft.IconButton(icon=ft.icons.ARROW_FORWARD_IOS, data=self.NEXT_MONTH, on_click=self._adjust_calendar, icon_color=ft.colors.BLACK54) if not hide_ymhm else ft.Text(self.EMPTY)
+        year_text = ft.Text(year, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400)
+        month_text = ft.Text(self.locale_names.month_names[month], text_align=ft.alignment.center, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400)
+        if view:
+            view.year_text = year_text
+            view.month_text = month_text
+        if not hide_ymhm:
+            # clicking the year or the month opens the year/month grid picker
+            year_text = ft.Container(year_text, data=self.YEAR_PICKER, on_click=self._open_ym_picker)
+            month_text = ft.Container(month_text, data=self.MONTH_PICKER, on_click=self._open_ym_picker)
         ym = ft.Row([
                     ft.Row([
                         prev_year,
-                        ft.Text(year, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400),
+                        year_text,
                         next_year,
                     ], spacing=0),
                     ft.Row([
                         prev_month,
-                        ft.Text(calendar.month_name[month], text_align=ft.alignment.center, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400),
+                        month_text,
                         next_month,
                     ], spacing=0),
                 ], spacing=0, alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
@@ -216,78 +457,272 @@ class DatePicker(ft.UserControl):
 
     def _row_labels(self):
         label_row = []
-        days_label = calendar.weekheader(2).split(self.WHITE_SPACE)
-        for i in range(0, self.first_weekday): days_label.append(days_label.pop(0))
-        for l in days_label:
+        for l in self.locale_names.weekday_labels(self.first_weekday):
             label_row.append(
                 ft.TextButton(
                     text=l, 
                     width=self.CELL_SIZE, 
                     height=self.CELL_SIZE,
                     disabled=True,
-                    style=ft.ButtonStyle(
-                        padding=0, 
-                        color=ft.colors.BLACK,
-                        bgcolor=ft.colors.GREY_300, 
-                        shape={
-                            ft.MaterialState.DEFAULT: ft.RoundedRectangleBorder(radius=20),
-                        }
-                    )
+                    style=label_style()
                 )
             )
                 
         return label_row
     
     def _hour_minute_selector(self, hour, minute):
+        self.hour_text = self._hh_min_field(hour, self.HOUR)
+        self.minute_text = self._hh_min_field(minute, self.MINUTE)
         hm = ft.Row(
             [
                 ft.Row([
-                    ft.IconButton(icon=ft.icons.ARROW_BACK_IOS_NEW, data=self.PREV_HOUR, on_click=self._adjust_hh_min, icon_color=ft.colors.BLACK54),
-                    ft.Text(hour, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400),
-                    ft.IconButton(icon=ft.icons.ARROW_FORWARD_IOS, data=self.NEXT_HOUR, on_click=self._adjust_hh_min, icon_color=ft.colors.BLACK54),
+                    self._hh_min_button(ft.icons.ARROW_BACK_IOS_NEW, self.PREV_HOUR),
+                    self.hour_text,
+                    self._hh_min_button(ft.icons.ARROW_FORWARD_IOS, self.NEXT_HOUR),
                 ]),
                 ft.Text(":"),
                 ft.Row([
-                    ft.IconButton(icon=ft.icons.ARROW_BACK_IOS_NEW, data=self.PREV_MINUTE, on_click=self._adjust_hh_min, icon_color=ft.colors.BLACK54),
-                    ft.Text(minute, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400),
-                    ft.IconButton(icon=ft.icons.ARROW_FORWARD_IOS, data=self.NEXT_MINUTE, on_click=self._adjust_hh_min, icon_color=ft.colors.BLACK54),
+                    self._hh_min_button(ft.icons.ARROW_BACK_IOS_NEW, self.PREV_MINUTE),
+                    self.minute_text,
+                    self._hh_min_button(ft.icons.ARROW_FORWARD_IOS, self.NEXT_MINUTE),
                 ]),
             ], spacing=48, alignment=ft.MainAxisAlignment.SPACE_EVENLY)
                 
         return hm
 
-    def build(self):  
-        
-        rows = self._create_layout(self.yy, self.mm, self.hour, self.minute)
+    def _hh_min_button(self, icon, data):
+        # holding the button down keeps stepping, see _start_repeat
+        return ft.GestureDetector(
+            content=ft.IconButton(icon=icon, data=data, on_click=self._adjust_hh_min, icon_color=ft.colors.BLACK54),
+            data=data,
+            on_long_press_start=self._start_repeat,
+            on_long_press_end=self._stop_repeat
+        )
 
-        cal_height = self._calculate_heigth(self.yy, self.mm)
+    def _hh_min_field(self, value, data):
+        return ft.TextField(
+            value=str(value),
+            data=data,
+            width=self.CELL_SIZE + 8,
+            dense=True,
+            border=ft.InputBorder.NONE,
+            text_align=ft.TextAlign.CENTER,
+            text_style=ft.TextStyle(weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400),
+            keyboard_type=ft.KeyboardType.NUMBER,
+            input_filter=ft.NumbersOnlyInputFilter(),
+            max_length=2,
+            counter_text=self.EMPTY,
+            on_submit=self._set_hh_min,
+            on_focus=self._edit_hh_min,
+            on_blur=self._set_hh_min
+        )
 
+    def build(self):  
+        
         self.cal_container = ft.Container(
-            content=ft.Row(rows),
+            content=self._create_content(),
             bgcolor=ft.colors.WHITE,
             padding=12,
-            height=self._cal_height(cal_height)
+            height=self._layout_height()
         )
         return self.cal_container
 
+    def _create_content(self):
+        self.month_views = []
+        if self.scroll_months:
+            content = self._create_scroll_layout(self.yy, self.mm, self.hour, self.minute)
+        else:
+            content = ft.Row(self._create_layout(self.yy, self.mm, self.hour, self.minute))
+
+        # the year/month grid picker is created on first use and shown in place of the months
+        self.months_layout = content
+        self.ym_picker = None
+        self.ym_picker_mode = None
+        self.ym_picker_year = None
+        return ft.Column([content], spacing=0)
+
+    # options changing the control tree, the other ones only re-render the cells
+    LAYOUT_OPTIONS = ("hour_minute", "show_three_months", "scroll_months")
+    ENGINE_OPTIONS = ("disable_to", "disable_from", "holidays", "disabled_rules", "hide_prev_next_month_days")
+
+    def reconfigure(self, **options):
+        # updates the given options in place; on a built picker only what changed is re-rendered
+        rebuild, relabel = self._apply_options(options)
+        if not self.month_views:
+            return
+        if rebuild:
+            self._rebuild()
+            return
+        if relabel:
+            self._relabel()
+        self._update_calendar()
+
+    def reset(self, **options):
+        # every option not given goes back to its default, the picker shows the
+        # month of the first selected day (or the current month) again
+        rebuild, relabel = self._apply_options(dict(self._defaults(), **options))
+        engine = self.engine
+        now = engine.current_time()
+        first = min(engine.selected, key=engine.day, default=None)
+        day = engine.day(first) if first else now
+        engine.focus = None
+        engine.set_time(now.hour, now.minute)
+        if not self.month_views or rebuild:
+            engine.jump_to(day.year, day.month)
+            if rebuild:
+                self._rebuild()
+            return
+        if relabel:
+            self._relabel()
+        self.jump_to(day.year, day.month)
+
+    def _apply_options(self, options):
+        defaults = self._defaults()
+        unknown = set(options) - set(defaults)
+        if unknown:
+            raise TypeError(f"unknown DatePicker options: {', '.join(sorted(unknown))}")
+
+        engine = self.engine
+        rebuild = False
+        relabel = False
+        # the zone goes first, the dates given with it are converted to the new one
+        if "tz" in options:
+            engine.set_zone(options["tz"])
+        for name, value in options.items():
+            if name in self.LAYOUT_OPTIONS:
+                if value != getattr(self, name):
+                    setattr(self, name, value)
+                    rebuild = True
+            elif name in self.ENGINE_OPTIONS:
+                current = engine.holidays_source if name == "holidays" else getattr(engine, name)
+                if value is not current:
+                    setattr(engine, name, value)
+            elif name == "first_weekday":
+                if value != engine.first_weekday:
+                    engine.first_weekday = value
+                    relabel = True
+            elif name == "locale":
+                if value != self._locale:
+                    self._locale = value
+                    self._locale_names = value if isinstance(value, LocaleNames) else None
+                    relabel = True
+            elif name == "availability":
+                current = engine.availability
+                if value is not current and value is not getattr(current, "provider", None):
+                    self._listen(False)
+                    engine.availability = value
+                    self._listen(True)
+            elif name == "keyboard":
+                if value != self.keyboard:
+                    self._listen(False)
+                    self.keyboard = value
+                    self._listen(True)
+            elif name == "metrics":
+                self.metrics = as_collector(value)
+            elif name == "update_delay":
+                self._scheduler.delay = value
+            elif name == "on_change":
+                self.on_change = value
+            elif name == "decorators":
+                # cells get a badge text when the picker has decorators
+                rebuild |= bool(value) != bool(self._decorators)
+                self._listen(False)
+                self.decorators = value
+                self._listen(True)
+            elif name in ("on_select_change", "change_delay"):
+                self._set_change_handler(options.get("on_select_change", self.on_select_change), options.get("change_delay"))
+
+        if {"selection_type", "selected_date", "multiple_ranges"} & set(options):
+            engine.set_selection(
+                options.get("selection_type"),
+                options.get("selected_date"),
+                options.get("multiple_ranges"),
+                keep="selected_date" not in options
+            )
+        return rebuild, relabel
+
+    @classmethod
+    def _defaults(cls):
+        if "_default_options" not in cls.__dict__:
+            parameters = inspect.signature(cls.__init__).parameters.values()
+            cls._default_options = {p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty}
+        return cls._default_options
+
+    def _set_change_handler(self, handler, delay = None):
+        self.on_select_change = handler
+        if not handler:
+            self._change_scheduler = None
+            self.engine.changes = None
+            return
+        if self._change_scheduler is None:
+            self._change_scheduler = UpdateScheduler(self._emit_selection_change, delay or 0)
+            self.engine.changes = ChangeBatch(self.flush_changes)
+        elif delay is not None:
+            self._change_scheduler.delay = delay
+
+    # (un)registers the decorator, availability and keyboard listeners of a mounted picker
+    def _listen(self, on):
+        if not self.page:
+            return
+        if on:
+            for decorator in self._decorators:
+                decorator.add_listener(self._on_decorator_changed)
+            if self.availability:
+                self.availability.add_listener(self._on_availability_loaded)
+            if self.keyboard:
+                # page handlers are chained, the ones already set keep receiving events
+                first = self.page.on_keyboard_event.count() == 0
+                self.page.on_keyboard_event = self._on_keyboard
+                if first:
+                    # the client only sends key events once the page has been
+                    # updated with a handler, mounting happens after that update
+                    self.page.update()
+        else:
+            for decorator in self._decorators:
+                decorator.remove_listener(self._on_decorator_changed)
+            if self.availability:
+                self.availability.remove_listener(self._on_availability_loaded)
+            if self.keyboard:
+                self.page.on_keyboard_event.unsubscribe(self._on_keyboard)
+
+    def _relabel(self):
+        labels = self.locale_names.weekday_labels(self.first_weekday)
+        for view in self.month_views:
+            for button, text in zip(view.labels, labels):
+                button.text = text
+        if self.scroll_months:
+            self.scroll_header.month_text.value = self.locale_names.month_names[self._shown_year_month()[1]]
+
+    def _rebuild(self):
+        patched = self.patched_cells
+        self.cal_container.content = self._create_content()
+        self.cal_container.height = self._layout_height()
+        self._send_update(self.patched_cells - patched)
+
+    def _layout_height(self):
+        if self.scroll_months:
+            return self.SCROLL_LAYOUT_DT_HEIGHT if self.hour_minute else self.SCROLL_LAYOUT_HEIGHT
+        return self._cal_height(self._calculate_heigth(self.yy, self.mm))
+
     def _calculate_heigth(self, year, month):
         if self.show_three_months:
-            prev, next = self._prev_next_month(year, month)
+            prev, next = self.engine.prev_next_month(year, month)
             cal_height = max(
-                len(self._get_current_month(year, month)),
-                len(self._get_current_month(prev.year, prev.month)),
-                len(self._get_current_month(next.year, next.month))
+                self.engine.weeks_number(year, month),
+                self.engine.weeks_number(*prev),
+                self.engine.weeks_number(*next)
             )
         else:
-            cal_height = len(self._get_current_month(year, month))
+            cal_height = self.engine.weeks_number(year, month)
         return cal_height
 
+    @timed("create_layout", lambda self, rows: count_controls(rows))
     def _create_layout(self, year, month, hour, minute):
         rows = []
-        prev, next = self._prev_next_month(year, month)
+        prev, next = self.engine.prev_next_month(year, month)
         
         if self.show_three_months:
-            week_rows_controls_prev = self._create_calendar(prev.year, prev.month, hour, minute, True)
+            week_rows_controls_prev = self._create_calendar(*prev, hour, minute, True)
             rows.append(ft.Column(week_rows_controls_prev, width=self.LAYOUT_WIDTH, spacing=10))
             rows.append(ft.VerticalDivider())
 
@@ -296,106 +731,397 @@ class DatePicker(ft.UserControl):
             
         if self.show_three_months:
             rows.append(ft.VerticalDivider())
-            week_rows_controls_next= self._create_calendar(next.year, next.month, hour, minute, True)
+            week_rows_controls_next= self._create_calendar(*next, hour, minute, True)
             rows.append(ft.Column(week_rows_controls_next, width=self.LAYOUT_WIDTH, spacing=10))
 
         return rows
 
-    def _prev_next_month(self, year, month):
-        delta = timedelta(days=calendar.monthrange(year, month)[1])
-        current = datetime(year, month, 15)
-        prev = current - delta
-        next = current + delta
-        return prev,next
-    
+    @timed("create_layout", lambda self, layout: count_controls([layout]))
+    def _create_scroll_layout(self, year, month, hour, minute):
+        # only a small pool of month panels is realized, each one absolutely
+        # positioned in a stack as tall as the whole list and moved/re-rendered
+        # in place when it scrolls out of the visible window
+        self.scroll_header = _MonthView()
+        ym = self._year_month_selectors(year, month, False, self.scroll_header)
+
+        self.scroll_first = 0
+        slots = []
+        pool_size = min(self.scroll_months, self.SCROLL_VISIBLE_MONTHS + 2 * self.SCROLL_BUFFER_MONTHS)
+        for i in range(0, pool_size):
+            y, m = self.engine.shift_month(year, month, i)
+            week_rows_controls = self._create_calendar(y, m, hour, minute, True, m)
+            view = self.month_views[-1]
+            view.index = i
+            view.container = ft.Container(
+                content=ft.Column(week_rows_controls, width=self.LAYOUT_WIDTH, spacing=10),
+                top=i * self.MONTH_EXTENT,
+                left=0,
+                height=self.MONTH_EXTENT
+            )
+            slots.append(view.container)
+
+        self.scroll_list = ft.Column(
+            [ft.Stack(slots, width=self.LAYOUT_WIDTH, height=self.scroll_months * self.MONTH_EXTENT)],
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+            on_scroll=self._on_months_scroll,
+            on_scroll_interval=self.SCROLL_INTERVAL
+        )
+
+        controls = [ym, self.scroll_list]
+        if self.hour_minute:
+            controls.append(ft.Row([self._hour_minute_selector(hour, minute)], alignment=ft.MainAxisAlignment.CENTER))
+        return ft.Column(controls, width=self.LAYOUT_WIDTH, spacing=10, expand=True)
+
+    def _realize_months(self, first):
+        pool = self.month_views
+        start = max(0, min(first - self.SCROLL_BUFFER_MONTHS, self.scroll_months - len(pool)))
+        wanted = range(start, start + len(pool))
+        free = [view for view in pool if view.index not in wanted]
+        realized = {view.index for view in pool}
+        for i in wanted:
+            if i in realized:
+                continue
+            view = free.pop()
+            view.index = i
+            view.container.top = i * self.MONTH_EXTENT
+            y, m = self.engine.shift_month(self.yy, self.mm, i)
+            self._render_calendar(view, y, m, m)
+
+        y, m = self.engine.shift_month(self.yy, self.mm, first)
+        self.scroll_header.year_text.value = y
+        self.scroll_header.month_text.value = self.locale_names.month_names[m]
+        self.scroll_first = first
+
+    def _on_months_scroll(self, e):
+        first = max(0, min(int(e.pixels // self.MONTH_EXTENT), self.scroll_months - 1))
+        if first == self.scroll_first:
+            return
+        patched = self.patched_cells
+        self._realize_months(first)
+        self._send_update(self.patched_cells - patched)
+
+    def _scroll_by_months(self, delta):
+        first = max(0, min(self.scroll_first + delta, self.scroll_months - 1))
+        patched = self.patched_cells
+        self._realize_months(first)
+        self._send_update(self.patched_cells - patched)
+        self.scroll_list.scroll_to(offset=first * self.MONTH_EXTENT, duration=300)
+
+    def _render_layout(self, year, month, hour, minute):
+        if self.scroll_months:
+            for view in self.month_views:
+                y, m = self.engine.shift_month(year, month, view.index)
+                self._render_calendar(view, y, m, m)
+            if self.hour_minute:
+                self.hour_text.value = str(hour)
+                self.minute_text.value = str(minute)
+            return
+
+        prev, next = self.engine.prev_next_month(year, month)
+
+        if self.show_three_months:
+            months = [prev, (year, month), next]
+        else:
+            months = [(year, month)]
+
+        for view, (y, m) in zip(self.month_views, months):
+            self._render_calendar(view, y, m)
+
+        if self.hour_minute:
+            self.hour_text.value = str(hour)
+            self.minute_text.value = str(minute)
+
+    def _create_ym_picker(self):
+        self.ym_picker_title = ft.Text(self.EMPTY, weight=ft.FontWeight.BOLD, color=ft.colors.BLUE_400)
+        header = ft.Row([
+                    ft.IconButton(icon=ft.icons.ARROW_BACK_IOS_NEW, data=self.PICKER_PREV, on_click=self._page_ym_picker, icon_color=ft.colors.BLACK54),
+                    ft.Container(self.ym_picker_title, data=self.YEAR_PICKER, on_click=self._open_ym_picker),
+                    ft.IconButton(icon=ft.icons.ARROW_FORWARD_IOS, data=self.PICKER_NEXT, on_click=self._page_ym_picker, icon_color=ft.colors.BLACK54),
+                    ft.IconButton(icon=ft.icons.CLOSE, data=self.PICKER_CLOSE, on_click=self._close_ym_picker, icon_color=ft.colors.BLACK54),
+                ], spacing=0, alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
+
+        # the same cells show the years of a decade or the months of a year
+        self.ym_picker_cells = []
+        self.ym_picker_keys = []
+        rows = [header]
+        for _ in range(0, self.PICKER_ROWS):
+            row = []
+            for _ in range(0, self.PICKER_COLUMNS):
+                cell = ft.TextButton(
+                    text=self.EMPTY,
+                    width=self.PICKER_CELL_WIDTH,
+                    height=self.CELL_SIZE,
+                    on_click=self._pick_ym
+                )
+                row.append(cell)
+                self.ym_picker_cells.append(cell)
+                self.ym_picker_keys.append(None)
+            rows.append(ft.Row(row, alignment=ft.MainAxisAlignment.SPACE_AROUND))
+
+        self.ym_picker = ft.Column(rows, width=self.LAYOUT_WIDTH, spacing=10, visible=False)
+        self.cal_container.content.controls.append(self.ym_picker)
+
+    def _render_ym_picker(self):
+        year, month = self._shown_year_month()
+        if self.ym_picker_mode == self.YEAR_PICKER:
+            # a decade with the last year of the previous one and the first of the next
+            first = self.ym_picker_year // self.DECADE * self.DECADE - 1
+            self.ym_picker_title.value = f"{first + 1} - {first + self.DECADE}"
+            values = [(first + i, str(first + i), first + i == year) for i in range(0, len(self.ym_picker_cells))]
+        else:
+            self.ym_picker_title.value = str(self.ym_picker_year)
+            values = [(m, self.locale_names.month_abbr[m], (self.ym_picker_year, m) == (year, month)) for m in range(1, 13)]
+
+        for idx, (data, text, current) in enumerate(values):
+            cell = self.ym_picker_cells[idx]
+            cell.data = data
+            key = (text, current)
+            if self.ym_picker_keys[idx] == key:
+                continue
+            self.ym_picker_keys[idx] = key
+            cell.text = text
+            cell.style = day_style(ft.colors.WHITE, ft.colors.BLUE_400) if current else day_style(ft.colors.BLACK, None)
+            self.patched_cells += 1
+
+    def _shown_year_month(self):
+        if self.scroll_months:
+            return self.engine.shift_month(self.yy, self.mm, self.scroll_first)
+        return self.yy, self.mm
+
+    def _open_ym_picker(self, e: ft.ControlEvent):
+        if self.ym_picker is None:
+            self._create_ym_picker()
+        if not self.ym_picker.visible:
+            self.ym_picker_year = self._shown_year_month()[0]
+        self.ym_picker_mode = e.control.data
+        self._show_ym_picker(True)
+
+    def _close_ym_picker(self, e: ft.ControlEvent):
+        self._show_ym_picker(False)
+
+    def _show_ym_picker(self, visible):
+        patched = self.patched_cells
+        if visible:
+            self._render_ym_picker()
+        self.months_layout.visible = not visible
+        self.ym_picker.visible = visible
+        self._send_update(self.patched_cells - patched)
+
+    def _page_ym_picker(self, e: ft.ControlEvent):
+        step = self.DECADE if self.ym_picker_mode == self.YEAR_PICKER else 1
+        self.ym_picker_year += -step if e.control.data == self.PICKER_PREV else step
+        self._show_ym_picker(True)
+
+    @timed("pick_year_month")
+    def _pick_ym(self, e: ft.ControlEvent):
+        if self.ym_picker_mode == self.YEAR_PICKER:
+            self.ym_picker_year = e.control.data
+            self.ym_picker_mode = self.MONTH_PICKER
+            self._show_ym_picker(True)
+            return
+
+        self.months_layout.visible = True
+        self.ym_picker.visible = False
+        self.jump_to(self.ym_picker_year, e.control.data)
+
+    # compact, versioned state (selection, current month, time and options) to
+    # rehydrate the picker in another session, see datepicker.state.StateStore
+    def snapshot(self) -> bytes:
+        return self.engine.snapshot()
+
+    def restore(self, data: bytes | str):
+        # a built picker keeps its layout options (first_weekday, hour_minute)
+        self.engine.restore(data, options=not self.month_views)
+        if self.month_views:
+            if self.scroll_months:
+                self.jump_to(self.yy, self.mm)
+            else:
+                self._update_calendar()
+
+    def jump_to(self, year: int, month: int = None):
+        self.engine.jump_to(year, month)
+        self.engine.prefetch(self.yy, self.mm, 2 if self.show_three_months else 1)
+        if self.scroll_months and self.month_views:
+            # the list starts at the new month, the pool is moved back to the top
+            patched = self.patched_cells
+            self._realize_months(0)
+            self._render_layout(self.yy, self.mm, self.hour, self.minute)
+            self._send_update(self.patched_cells - patched)
+            self.scroll_list.scroll_to(offset=0)
+            return
+        if self.month_views:
+            self._update_calendar()
+
+    @timed("select_date")
     def _select_date(self, e: ft.ControlEvent):
         
         result: datetime = e.control.data
-        print(result)
-        print(self.selected)
-
-        if self.selection_type == SelectionType.RANGE:
-            if len(self.selected) == 2:
-                self.selected = []
-
-            if len(self.selected) > 0:
-                if self.selected[0] == result:
-                    self.selected = [] 
-                else:
-                    if result > self.selected[0]:
-                        if len(self.selected) == 1:
-                            self.selected.append(result)   
-                        else:
-                            return
-                    else:
-                        return
-            else:
-                self.selected.append(result)        
-        elif self.selection_type == SelectionType.MULTIPLE:
-            if len(self.selected) > 0 and result in self.selected:
-                self.selected.remove(result)
-            else:
-                if self.hour_minute:
-                    result = datetime(result.year, result.month, result.day, self.hour, self.minute)
-                self.selected.append(result)
-        else:
-            if len(self.selected) == 1 and result in self.selected:
-                self.selected.remove(result)
-            else:
-                self.selected = []
-                if self.hour_minute:
-                    result = datetime(result.year, result.month, result.day, self.hour, self.minute)
-                self.selected.append(result)
+        logger.debug("select %s, selected %d", result, len(self.selection))
+
+        if not self.engine.select(result):
+            return
 
-        self._on_change(self.selected)
+        self._on_change()
         self._update_calendar()
 
+    @timed("adjust_calendar")
     def _adjust_calendar(self, e: ft.ControlEvent):
 
-        print(self.yy, self.mm)
+        logger.debug("adjust calendar %s from %s-%s", e.control.data, self.yy, self.mm)
 
-        if(e.control.data == self.PREV_MONTH or e.control.data == self.NEXT_MONTH):
-            delta = timedelta(days=calendar.monthrange(self.yy, self.mm)[1])
-        if(e.control.data == self.PREV_YEAR or e.control.data == self.NEXT_YEAR):
-            delta = timedelta(weeks=self.DELTA_YEAR_WEEK)
+        if self.scroll_months:
+            step = 12 if e.control.data in (self.PREV_YEAR, self.NEXT_YEAR) else 1
+            self._scroll_by_months(-step if e.control.data in (self.PREV_YEAR, self.PREV_MONTH) else step)
+            y, m = self.engine.shift_month(self.yy, self.mm, self.scroll_first)
+            self.engine.prefetch(y, m, self.SCROLL_VISIBLE_MONTHS)
+            return
 
-        if(e.control.data == self.PREV_MONTH or e.control.data == self.PREV_YEAR):
-            self.now = self.now - delta
-        if(e.control.data == self.NEXT_MONTH or e.control.data == self.NEXT_YEAR):
-            self.now = self.now + delta
+        if e.control.data in (self.PREV_MONTH, self.NEXT_MONTH):
+            self.engine.step_month(-1 if e.control.data == self.PREV_MONTH else 1)
+        if e.control.data in (self.PREV_YEAR, self.NEXT_YEAR):
+            self.engine.step_year(-1 if e.control.data == self.PREV_YEAR else 1)
 
-        self.mm = self.now.month
-        self.yy = self.now.year
+        # the months around the new one are loaded in the background for the next step
+        self.engine.prefetch(self.yy, self.mm, 2 if self.show_three_months else 1)
         self._update_calendar()
 
+    @timed("adjust_hh_min")
     def _adjust_hh_min(self, e: ft.ControlEvent):
+        self._step_hh_min(e.control.data)
+        self._update_calendar()
+
+    def _step_hh_min(self, data):
+        direction = -1 if data in (self.PREV_HOUR, self.PREV_MINUTE) else 1
+        self.engine.step_time(direction, hours=data in (self.PREV_HOUR, self.NEXT_HOUR))
 
-        if(e.control.data == self.PREV_HOUR or e.control.data == self.NEXT_HOUR):
-            delta = timedelta(hours=self.DELTA_HOUR)
-        if(e.control.data == self.PREV_MINUTE or e.control.data == self.NEXT_MINUTE):
-            delta = timedelta(minutes=self.DELTA_MINUTE)
+    def _edit_hh_min(self, e: ft.ControlEvent):
+        self.editing = True
 
-        if(e.control.data == self.PREV_HOUR or e.control.data == self.PREV_MINUTE):
-            self.now = self.now - delta
-        if(e.control.data == self.NEXT_HOUR or e.control.data == self.NEXT_MINUTE):
-            self.now = self.now + delta
+    @timed("set_hh_min")
+    def _set_hh_min(self, e: ft.ControlEvent):
+        if e.name == "blur":
+            self.editing = False
+        limit = 23 if e.control.data == self.HOUR else 59
+        try:
+            value = int(e.control.value)
+        except (TypeError, ValueError):
+            value = None
 
-        self.hour = self.now.hour
-        self.minute = self.now.minute
+        if value is None or value < 0 or value > limit:
+            # restore the current value
+            e.control.value = str(self.hour if e.control.data == self.HOUR else self.minute)
+        elif e.control.data == self.HOUR:
+            self.engine.set_time(hour=value)
+        else:
+            self.engine.set_time(minute=value)
         self._update_calendar()
 
+    def _start_repeat(self, e: ft.ControlEvent):
+        self._stop_repeat(e)
+        data = e.control.data
+        stop = self._repeat_stop = threading.Event()
+
+        def repeat():
+            # steps are applied right away, renders are coalesced by the scheduler
+            while not stop.wait(self.REPEAT_INTERVAL):
+                self._step_hh_min(data)
+                self._scheduler.request(self.REPEAT_RENDER_DELAY)
+
+        threading.Thread(target=repeat, daemon=True).start()
+
+    def _stop_repeat(self, e: ft.ControlEvent):
+        if self._repeat_stop:
+            self._repeat_stop.set()
+            self._repeat_stop = None
+            self._scheduler.flush()
+
+    def _on_keyboard(self, e: ft.KeyboardEvent):
+        key = self.KEYS.get(e.key)
+        if key is None or not self.active or self.editing or not self.month_views or (self.ym_picker and self.ym_picker.visible):
+            return
+        if key == self.KEY_SELECT:
+            self._select_focused()
+            return
+
+        days, months = key
+        if months and e.shift:
+            months *= 12
+        self._move_focus(days, months)
+
+    @timed("move_focus")
+    def _move_focus(self, days = 0, months = 0):
+        old = self.engine.focus
+        new = self.engine.move_focus(days, months)
+        if not self._show_month(new.year, new.month):
+            # without a full render only the two focused cells are restyled
+            patched = self.patched_cells
+            self._restyle_day(old)
+            self._restyle_day(new)
+            if self.patched_cells != patched:
+                self._send_update(self.patched_cells - patched)
+
+    def _show_month(self, year, month):
+        # brings the month in view, returns True when the whole calendar is re-rendered
+        if self.scroll_months:
+            offset = (year * 12 + month) - (self.yy * 12 + self.mm)
+            if offset < 0 or offset >= self.scroll_months:
+                self.jump_to(year, month)
+                return True
+            if not self.scroll_first <= offset < self.scroll_first + self.SCROLL_VISIBLE_MONTHS:
+                # months already realized keep their cells, the focus is restyled afterwards
+                self._scroll_by_months(offset - self.scroll_first)
+            return False
+        if (year, month) == (self.yy, self.mm):
+            return False
+        self.jump_to(year, month)
+        return True
+
+    def _restyle_day(self, d):
+        if d is None:
+            return
+        for view in self.month_views:
+            if not view.days or not view.days[0] <= d <= view.days[-1]:
+                continue
+            idx = (d - view.days[0]).days
+            annotations = self._annotations(view.days)
+            state = self.engine.cell_state(view.year, view.month, d, view.main_month)
+            key = self._day_cell_state(d, state, annotations[idx] if annotations else None)
+            if view.cell_keys[idx] == key:
+                continue
+            view.cell_keys[idx] = key
+            self._patch_cell(view, idx, key)
+            self.patched_cells += 1
+
+    def _select_focused(self):
+        d = self.engine.focus
+        if d is None or self.engine.is_disabled(d):
+            return
+        if self.engine.select(self.engine.cell_value(d)):
+            self._on_change()
+            self._update_calendar()
+
+    # re-renders after data the picker does not track changed, e.g. a shared HolidayCalendar
+    def refresh(self):
+        if self.month_views:
+            self._update_calendar()
+
     def _update_calendar(self):
-        self.cal_container.content = ft.Row(self._create_layout(self.yy, self.mm, self.hour, self.minute))
-        cal_height = self._calculate_heigth(self.yy, self.mm)
-        self.cal_container.height = self._cal_height(cal_height)
+        self._scheduler.request()
+
+    def _render_update(self):
+        patched = self.patched_cells
+        self._render_layout(self.yy, self.mm, self.hour, self.minute)
+        self.cal_container.height = self._layout_height()
+        self._send_update(self.patched_cells - patched)
+
+    @timed("update", lambda self, patched: patched)
+    def _send_update(self, patched):
         self.update()
+        return patched
 
     def _cal_height(self, weeks_number):
         if self.hour_minute:
             return self.LAYOUT_DT_MIN_HEIGHT if weeks_number == 5 else self.LAYOUT_DT_MAX_HEIGHT
         else:
             return self.LAYOUT_MIN_HEIGHT if weeks_number == 5 else self.LAYOUT_MAX_HEIGHT
-        
-    def _trunc_datetime(self, date):
-        return date.replace(hour=0, minute=0, second=0, microsecond=0)
-    
@@ -0,0 +1,127 @@
+from bisect import bisect_left
+from collections import OrderedDict
+
+from datepicker.selection import day_key
+
+# day decorators annotate the cells of a month grid with a heat color and a
+# badge text. Annotations are computed once per grid (a month for a given
+# first weekday) and cached until the data changes, rendering only reads them.
+# A data change notifies the pickers showing the decorator, which re-render.
+
+HEAT_COLORS = ("green100", "green200", "green300", "green400", "green600")
+
+
+class DayDecorator:
+
+    _listeners = ()
+
+    def add_listener(self, listener: callable):
+        self._listeners = self._listeners + (listener,)
+
+    def remove_listener(self, listener: callable):
+        self._listeners = tuple(l for l in self._listeners if l != listener)
+
+    # to be called after the data changed
+    def changed(self):
+        for listener in self._listeners:
+            listener()
+
+    # returns, for each day of the grid, a (color, badge) pair or None
+    def annotate(self, days) -> tuple:
+        raise NotImplementedError
+
+
+class DayValues(DayDecorator):
+
+    # values is a mapping date -> number, or a columnar sequence (list, array,
+    # numpy array) of numbers for consecutive days starting at start. Numbers
+    # are bucketed into colors by thresholds, or evenly up to the max value.
+    def __init__(self, values=None, start=None, colors=HEAT_COLORS, thresholds=None, badge: str = "{}", maxsize: int = 36):
+        self.colors = tuple(colors)
+        self.thresholds = thresholds
+        self.badge = badge
+        self.maxsize = maxsize
+        self._points = {}
+        self._columns = []
+        self._max = 0
+        self._levels = ()
+        self._grids = OrderedDict()
+        if values is not None:
+            self.add(values, start)
+
+    def add(self, values, start=None):
+        if start is None:
+            points = {day_key(d).toordinal(): v for d, v in values.items()}
+            self._points.update(points)
+            top = max(points.values(), default=0)
+        else:
+            self._columns.append((day_key(start).toordinal(), values))
+            top = max(values, default=0)
+        self._max = max(self._max, top)
+        self.changed()
+
+    def clear(self):
+        self._points = {}
+        self._columns = []
+        self._max = 0
+        self.changed()
+
+    def value(self, d):
+        o = day_key(d).toordinal()
+        if o in self._points:
+            return self._points[o]
+        for start, column in reversed(self._columns):
+            if start <= o < start + len(column):
+                return column[o - start]
+        return None
+
+    def annotate(self, days) -> tuple:
+        key = (days[0].toordinal(), len(days))
+        grid = self._grids.get(key)
+        if grid is not None:
+            self._grids.move_to_end(key)
+            return grid
+
+        first, n = key
+        values = [None] * n
+        # columns are sliced over the grid, later ones win, single points win over columns
+        for start, column in self._columns:
+            lo = max(first, start)
+            hi = min(first + n, start + len(column))
+            if lo < hi:
+                values[lo - first:hi - first] = column[lo - start:hi - start]
+        if self._points:
+            for i in range(0, n):
+                v = self._points.get(first + i)
+                if v is not None:
+                    values[i] = v
+
+        grid = tuple(self._annotation(v) if v else None for v in values)
+        self._grids[key] = grid
+        if len(self._grids) > self.maxsize:
+            self._grids.popitem(last=False)
+        return grid
+
+    def _annotation(self, value):
+        color = self.colors[min(bisect_left(self._levels, value), len(self.colors) - 1)] if self.colors else None
+        badge = self.badge.format(value) if self.badge else None
+        return color, badge
+
+    def changed(self):
+        self._grids.clear()
+        if self.thresholds is not None:
+            self._levels = tuple(self.thresholds)
+        else:
+            steps = len(self.colors)
+            self._levels = tuple(self._max * (i + 1) / steps for i in range(0, steps - 1))
+        super().changed()
+
+
+def merge_annotations(grids):
+    # the first color wins, badges are joined
+    merged = []
+    for annotations in zip(*grids):
+        color = next((a[0] for a in annotations if a and a[0]), None)
+        badges = [a[1] for a in annotations if a and a[1]]
+        merged.append((color, " · ".join(badges) or None) if color or badges else None)
+    return tuple(merged)
@@ -0,0 +1,389 @@
+from datetime import datetime, timedelta, tzinfo
+
+from datepicker.holidays import HolidayCalendar
+from datepicker.month_model import DISABLED, HOLIDAY, WEEKEND, MonthModelCache, month_weeks
+from datepicker.rules import Rule, compile_rules, date_only
+from datepicker.selection import Selection, day_key
+from datepicker.selection_type import SelectionType
+from datepicker.timezones import get_zone, month_offsets, to_zone
+
+# headless calendar state, no flet import: the DatePicker control renders the
+# MonthState produced here and forwards its events to the engine
+
+# day state bits, the first ones are the month model flags
+MAIN_MONTH = 8
+TODAY = 16
+SELECTED = 32
+IN_RANGE = 64
+HIDDEN = 128
+FOCUSED = 256
+
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def days_in_month(year, month):
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
+
+
+class MonthState:
+
+    __slots__ = ("year", "month", "main_month", "weeks_number", "days", "states")
+
+    def __init__(self, year, month, main_month, weeks_number, days, states):
+        self.year = year
+        self.month = month
+        self.main_month = main_month
+        self.weeks_number = weeks_number
+        self.days = days
+        self.states = states
+
+
+class CalendarEngine:
+
+    WEEKEND_DAYS = (5, 6)
+    DELTA_HOUR = 1
+    DELTA_MINUTE = 1
+
+    def __init__(self,
+            selection_type: SelectionType | int = SelectionType.SINGLE,
+            selected_date=None,
+            disable_to: datetime = None,
+            disable_from: datetime = None,
+            holidays=None,
+            first_weekday: int = 0,
+            hour_minute: bool = False,
+            hide_prev_next_month_days: bool = False,
+            multiple_ranges: bool = False,
+            disabled_rules: list[Rule] | Rule = None,
+            availability=None,
+            tz: str | tzinfo = None,
+            now: datetime = None
+        ):
+        self.month_models = MonthModelCache()
+        self._rules_version = 0
+        # with a zone, days are compared in that zone: aware values are converted
+        # to it, naive ones are taken as local to it
+        self.zone = get_zone(tz) if tz else None
+        # a ChangeBatch collecting the selection deltas, None when nobody listens
+        self.changes = None
+        self.set_selection(selection_type, selected_date, multiple_ranges)
+        self.disable_to = disable_to
+        self.disable_from = disable_from
+        self.holidays = holidays
+        self.disabled_rules = disabled_rules
+        self.availability = availability
+        self.first_weekday = first_weekday
+        self.hour_minute = hour_minute
+        self.hide_prev_next_month_days = hide_prev_next_month_days
+        # keyboard focus, a day of the main month or None
+        self.focus = None
+
+        self.now = self.to_zone(now) if now else self.current_time()
+        self.yy = self.now.year
+        self.mm = self.now.month
+        self.hour = self.now.hour
+        self.minute = self.now.minute
+
+    @property
+    def selected(self):
+        return self.selection.values()
+
+    # replaces the selection; with keep the current values are kept when the type does not change
+    def set_selection(self, selection_type = None, selected_date = None, multiple_ranges: bool = None, keep: bool = False):
+        selection_type = self.selection_type if selection_type is None else SelectionType.from_value(selection_type)
+        if multiple_ranges is None:
+            multiple_ranges = getattr(self.selection, "multiple_ranges", False)
+        if keep and selected_date is None and selection_type == self.selection_type:
+            selected_date = self.selection.values()
+        elif self.zone and selected_date:
+            selected_date = [to_zone(v, self.zone) for v in selected_date]
+        if self.changes is not None:
+            # the undelivered changes of the replaced selection go out first
+            self.changes.flush()
+        self.selection_type = selection_type
+        self.selection = Selection.create(selection_type, selected_date, multiple_ranges)
+        if self.changes is not None:
+            self.changes.take()
+
+    # the recorded changes and the selection they lead to, taken together
+    def take_changes(self):
+        selection = self.selection
+        with selection.lock:
+            added, removed = self.changes.take()
+            selected = tuple(selection.values()) if added or removed else ()
+        return added, removed, selected
+
+    @property
+    def holidays(self):
+        return self._holidays
+
+    @holidays.setter
+    def holidays(self, value):
+        # a HolidayCalendar is shared as is, so many pickers can reference one registry;
+        # the value as given is kept to convert it again when the zone changes
+        self.holidays_source = value
+        if not isinstance(value, HolidayCalendar):
+            if self.zone and value:
+                value = [to_zone(h, self.zone) for h in value]
+            value = HolidayCalendar(value)
+        self._holidays = value
+        self.invalidate()
+
+    @property
+    def disable_to(self):
+        return self._disable_to
+
+    @disable_to.setter
+    def disable_to(self, value):
+        self._disable_to = value
+        self._disable_to_day = self.day(value) if value else None
+        self.invalidate()
+
+    @property
+    def disable_from(self):
+        return self._disable_from
+
+    @disable_from.setter
+    def disable_from(self, value):
+        self._disable_from = value
+        self._disable_from_day = self.day(value) if value else None
+        self.invalidate()
+
+    @property
+    def disabled_rules(self):
+        return self._disabled_rules
+
+    @disabled_rules.setter
+    def disabled_rules(self, value):
+        self._disabled_rules = value
+        self._compiled_rules = compile_rules(value)
+        self._date_rules = date_only(self._compiled_rules)
+        self.invalidate()
+
+    @property
+    def availability(self):
+        return self._availability
+
+    @availability.setter
+    def availability(self, value):
+        # a provider gets its own cache, pass an AvailabilityCache to share one between pickers
+        if value is not None:
+            from datepicker.availability import AvailabilityCache
+            if not isinstance(value, AvailabilityCache):
+                value = AvailabilityCache(value)
+        self._availability = value
+        self.invalidate()
+
+    # converts the state to another zone as if the engine was created with it,
+    # returns False (and keeps the cached month models) when the zone is the same
+    def set_zone(self, tz: str | tzinfo = None) -> bool:
+        zone = get_zone(tz) if tz else None
+        if zone == self.zone:
+            return False
+        self.zone = zone
+        if zone:
+            self.now = to_zone(self.now, zone)
+        elif self.now.tzinfo is not None:
+            self.now = self.now.astimezone().replace(tzinfo=None)
+        self.hour = self.now.hour
+        self.minute = self.now.minute
+        self.jump_to(self.yy, self.mm)
+        # the selection is rebuilt as is, the undelivered changes are kept
+        values = [self.to_zone(v) for v in self.selection.values()]
+        self.selection = Selection.create(self.selection_type, values, getattr(self.selection, "multiple_ranges", False))
+        self.disable_to = self._disable_to
+        self.disable_from = self._disable_from
+        self.holidays = self.holidays_source
+        return True
+
+    def current_time(self) -> datetime:
+        return datetime.now(self.zone)
+
+    def to_zone(self, value):
+        return to_zone(value, self.zone) if self.zone else value
+
+    def day(self, value):
+        return day_key(self.to_zone(value))
+
+    def invalidate(self):
+        self._rules_version += 1
+        self.month_models.clear()
+
+    def month_model(self, year, month):
+        version = (self._rules_version, self._holidays.version)
+        masks = []
+        # without hour_minute the time-dependent rules (HourWindow) are skipped,
+        # a date-only picker keeps those days open whatever the time of day
+        rules = self._compiled_rules if self.hour_minute else self._date_rules
+        if rules:
+            hour, minute = self.hour, self.minute
+            if rules.time_dependent:
+                version += (hour, minute)
+            masks.append(lambda days: rules.mask(days, hour, minute))
+        availability = self._availability
+        if availability:
+            # starts a background fetch when the month is missing or expired,
+            # the month is rendered as available until the data arrives
+            availability.get(year, month)
+            # keyed on the months the grid shows, from the last days of the
+            # previous month to the first days of the next one
+            weeks = month_weeks(year, month, self.first_weekday)
+            first, last = weeks[0][0], weeks[-1][-1]
+            version += (
+                availability.month_version(first.year, first.month),
+                availability.month_version(year, month),
+                availability.month_version(last.year, last.month),
+            )
+            masks.append(availability.mask)
+        disabled_mask = None
+        if masks:
+            disabled_mask = masks[0] if len(masks) == 1 else lambda days: masks[0](days) | masks[1](days)
+        return self.month_models.get(year, month, self.first_weekday, version, self.day_flags, disabled_mask)
+
+    def is_disabled(self, value) -> bool:
+        d = self.day(value)
+        model = self.month_model(d.year, d.month)
+        return bool(model.flags[model.index(d)] & DISABLED)
+
+    def day_flags(self, d):
+        flags = 0
+        if d.weekday() in self.WEEKEND_DAYS:
+            flags |= WEEKEND
+        if d in self._holidays:
+            flags |= HOLIDAY
+        if self._disable_from_day and d > self._disable_from_day:
+            flags |= DISABLED
+        if self._disable_to_day and d < self._disable_to_day:
+            flags |= DISABLED
+        return flags
+
+    def weeks_number(self, year, month):
+        return self.month_model(year, month).weeks_number
+
+    def month_state(self, year, month, main_month = None, today = None) -> MonthState:
+        model = self.month_model(year, month)
+        today = today or self.current_time()
+        if isinstance(today, datetime):
+            today = today.date()
+        main_month = main_month or self.mm
+        states = [self.day_state(d, f, today, main_month) for d, f in zip(model.days, model.flags)]
+        return MonthState(year, month, main_month, model.weeks_number, model.days, states)
+
+    def day_state(self, d, flags, today, main_month) -> int:
+        state = flags
+        if d.month == main_month:
+            state |= MAIN_MONTH
+            if d == today:
+                state |= TODAY
+            if d == self.focus:
+                state |= FOCUSED
+        elif self.hide_prev_next_month_days:
+            return state | HIDDEN
+
+        if self.selection_type != SelectionType.RANGE:
+            if d in self.selection:
+                state |= SELECTED
+        elif self.selection.is_endpoint(d):
+            state |= SELECTED
+        elif self.selection.is_inside(d):
+            state |= IN_RANGE
+        return state
+
+    def cell_state(self, year, month, d, main_month = None, today = None) -> int:
+        # the state of a single day of a month grid, without building the whole MonthState
+        model = self.month_model(year, month)
+        today = today or self.current_time()
+        if isinstance(today, datetime):
+            today = today.date()
+        return self.day_state(d, model.flags[model.index(d)], today, main_month or self.mm)
+
+    def move_focus(self, days: int = 0, months: int = 0):
+        if self.focus is None:
+            self.focus = self._initial_focus()
+            return self.focus
+        if months:
+            y, m = self.shift_month(self.focus.year, self.focus.month, months)
+            self.focus = self.focus.replace(year=y, month=m, day=min(self.focus.day, days_in_month(y, m)))
+        self.focus += timedelta(days=days)
+        return self.focus
+
+    def _initial_focus(self):
+        # the first selected day of the current month, else today, else the 1st
+        for value in self.selected:
+            if value.year == self.yy and value.month == self.mm:
+                return day_key(value)
+        today = self.current_time().date()
+        if today.year == self.yy and today.month == self.mm:
+            return today
+        return datetime(self.yy, self.mm, 1).date()
+
+    def cell_value(self, d, hour: int = None, minute: int = None) -> datetime:
+        if hour is None:
+            hour, minute = (self.hour, self.minute) if self.hour_minute else (0, 0)
+        if self.zone:
+            # DST gaps and overlaps are resolved on the transition days of the cached month table
+            return month_offsets(self.zone, d.year, d.month).local(d.day, hour, minute)
+        return datetime(d.year, d.month, d.day, hour, minute)
+
+    def select(self, value) -> bool:
+        # the selection may have been replaced (restore), the batch follows it
+        self.selection.changes = self.changes
+        if self.hour_minute and self.selection_type != SelectionType.RANGE:
+            value = self.cell_value(self.day(value))
+        elif self.zone:
+            value = self.to_zone(value)
+        return self.selection.select(value)
+
+    # navigation is plain (year, month) arithmetic, a jump of any size costs the same as a step
+    def step_month(self, direction: int):
+        self.jump_to(*self.shift_month(self.yy, self.mm, direction))
+
+    def step_year(self, direction: int):
+        self.jump_to(*self.shift_month(self.yy, self.mm, 12 * direction))
+
+    def jump_to(self, year: int, month: int = None):
+        month = month or self.mm
+        # the day is clamped, e.g. jan 31 -> feb 28, and never drifts
+        day = min(self.now.day, days_in_month(year, month))
+        self.now = self.now.replace(year=year, month=month, day=day)
+        self.yy = year
+        self.mm = month
+
+    def step_time(self, direction: int, hours: bool = False):
+        delta = timedelta(hours=self.DELTA_HOUR) if hours else timedelta(minutes=self.DELTA_MINUTE)
+        self.now = self.now + delta * direction
+        self.hour = self.now.hour
+        self.minute = self.now.minute
+
+    def set_time(self, hour: int = None, minute: int = None):
+        if hour is not None:
+            self.now = self.now.replace(hour=hour)
+            self.hour = hour
+        if minute is not None:
+            self.now = self.now.replace(minute=minute)
+            self.minute = minute
+
+    def snapshot(self) -> bytes:
+        from datepicker.state import dumps
+        return dumps(self)
+
+    def restore(self, data: bytes | str, options: bool = True):
+        from datepicker.state import loads
+        loads(self, data, options)
+
+    def prefetch(self, year, month, months: int = 1):
+        if self._availability:
+            for delta in range(-months, months + 1):
+                if delta:
+                    self._availability.prefetch(*self.shift_month(year, month, delta))
+
+    def prev_next_month(self, year, month):
+        return self.shift_month(year, month, -1), self.shift_month(year, month, 1)
+
+    @staticmethod
+    def shift_month(year, month, delta):
+        y, m = divmod(year * 12 + month - 1 + delta, 12)
+        return y, m + 1
@@ -0,0 +1,134 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from datepicker.locale_names import LocaleNames
+
+# date patterns use the strftime directives below and are compiled once, per
+# locale, into a regex for parsing and a list of parts for formatting, so
+# typed entry never goes through strptime or the process locale
+
+_NUMBERS = {
+    "Y": ("year", r"\d{4}"),
+    "m": ("month", r"\d{1,2}"),
+    "d": ("day", r"\d{1,2}"),
+    "e": ("day", r"\s?\d{1,2}"),
+    "H": ("hour", r"\d{1,2}"),
+    "M": ("minute", r"\d{1,2}"),
+    "S": ("second", r"\d{1,2}"),
+}
+_NAMES = {
+    "B": ("month", "month_names"),
+    "b": ("month", "month_abbr"),
+    "A": (None, "day_names"),
+    "a": (None, "day_abbr"),
+}
+_DIRECTIVE = re.compile(r"%(.)")
+ISO_FORMAT = "%Y-%m-%d"
+_HINTS = {"Y": "yyyy", "m": "mm", "d": "dd", "e": "dd", "H": "hh", "M": "mm", "S": "ss", "B": "month", "b": "mon", "A": "weekday", "a": "wd"}
+
+
+class DateFormat:
+
+    def __init__(self, pattern: str, names: LocaleNames = None):
+        self.pattern = pattern
+        self.names = names
+        self.has_time = False
+        # literals are ("", text) pairs, directives (letter, None)
+        self._parts = []
+        self._months = {}
+        regex = []
+        pos = 0
+        for m in _DIRECTIVE.finditer(pattern):
+            literal = pattern[pos:m.start()]
+            pos = m.end()
+            if literal:
+                self._parts.append(("", literal))
+                regex.append(re.escape(literal).replace(r"\ ", r"\s+"))
+            d = m.group(1)
+            if d == "%":
+                self._parts.append(("", "%"))
+                regex.append("%")
+            elif d in _NUMBERS:
+                field, expr = _NUMBERS[d]
+                self.has_time |= field in ("hour", "minute", "second")
+                self._parts.append((d, None))
+                regex.append(f"(?P<{field}>{expr})")
+            elif d in _NAMES:
+                field, attr = _NAMES[d]
+                values = [v for v in getattr(names, attr) if v] if names else []
+                if not values:
+                    raise ValueError(f"{pattern!r}: %{d} needs locale names")
+                if field:
+                    self._months.update((v.casefold(), i) for i, v in enumerate(getattr(names, attr)) if v)
+                self._parts.append((d, None))
+                alternatives = "|".join(re.escape(v) for v in sorted(values, key=len, reverse=True))
+                regex.append(f"(?P<{field}_name>{alternatives})" if field else f"(?:{alternatives})")
+            else:
+                raise ValueError(f"{pattern!r}: unsupported directive %{d}")
+        if pattern[pos:]:
+            self._parts.append(("", pattern[pos:]))
+            regex.append(re.escape(pattern[pos:]).replace(r"\ ", r"\s+"))
+        self._regex = re.compile(r"\s*" + "".join(regex) + r"\s*", re.IGNORECASE)
+
+    # returns None when the text does not match or is not a valid date
+    def parse(self, text: str) -> datetime | None:
+        m = self._regex.fullmatch(text or "")
+        if m is None:
+            return None
+        g = m.groupdict()
+        month = self._months.get(g["month_name"].casefold()) if g.get("month_name") else g.get("month")
+        try:
+            return datetime(
+                int(g["year"]), int(month), int(g["day"]),
+                int(g.get("hour") or 0), int(g.get("minute") or 0), int(g.get("second") or 0)
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    # e.g. "dd/mm/yyyy" for "%d/%m/%Y"
+    @property
+    def hint(self) -> str:
+        return "".join(_HINTS[d] if d else text for d, text in self._parts)
+
+    def format(self, value) -> str:
+        out = []
+        for part, text in self._parts:
+            if not part:
+                out.append(text)
+            elif part == "Y":
+                out.append(f"{value.year:04d}")
+            elif part == "m":
+                out.append(f"{value.month:02d}")
+            elif part == "d":
+                out.append(f"{value.day:02d}")
+            elif part == "e":
+                out.append(f"{value.day:2d}")
+            elif part == "H":
+                out.append(f"{getattr(value, 'hour', 0):02d}")
+            elif part == "M":
+                out.append(f"{getattr(value, 'minute', 0):02d}")
+            elif part == "S":
+                out.append(f"{getattr(value, 'second', 0):02d}")
+            elif part == "B":
+                out.append(self.names.month_names[value.month])
+            elif part == "b":
+                out.append(self.names.month_abbr[value.month])
+            elif part == "A":
+                out.append(self.names.day_names[value.weekday()])
+            elif part == "a":
+                out.append(self.names.day_abbr[value.weekday()])
+        return "".join(out)
+
+
+@lru_cache(maxsize=128)
+def get_format(pattern: str = None, names: LocaleNames = None, hour_minute: bool = False) -> DateFormat:
+    # without a pattern the locale date format is used, with the time when needed;
+    # a locale format with directives not supported here (e.g. %Ey) falls back to ISO
+    if pattern is None:
+        time = " %H:%M" if hour_minute else ""
+        try:
+            return DateFormat((names.date_format if names else ISO_FORMAT) + time, names)
+        except ValueError:
+            return DateFormat(ISO_FORMAT + time, names)
+    return DateFormat(pattern, names)
@@ -0,0 +1,152 @@
+from datetime import date, datetime, timedelta, timezone
+
+from datepicker.selection import day_key
+from datepicker.timezones import get_zone
+
+
+class HolidayCalendar:
+
+    def __init__(self, holidays=None):
+        self._days = {}
+        self._yearly = {}
+        self.version = 0
+        if holidays:
+            self.add_all(holidays)
+
+    def __len__(self):
+        return len(self._days) + len(self._yearly)
+
+    def __contains__(self, value):
+        key = day_key(value)
+        return key in self._days or (key.month, key.day) in self._yearly
+
+    def __iter__(self):
+        return iter(self._days)
+
+    def label(self, value):
+        key = day_key(value)
+        if key in self._days:
+            return self._days[key]
+        return self._yearly.get((key.month, key.day))
+
+    def add(self, value, label: str = None, yearly: bool = False):
+        key = day_key(value)
+        if yearly:
+            self._yearly[(key.month, key.day)] = label
+        else:
+            self._days[key] = label
+        self.version += 1
+
+    def add_all(self, holidays, yearly: bool = False):
+        for h in holidays:
+            if isinstance(h, tuple):
+                key, label = day_key(h[0]), h[1]
+            else:
+                key, label = day_key(h), None
+            if yearly:
+                self._yearly[(key.month, key.day)] = label
+            else:
+                self._days[key] = label
+        self.version += 1
+
+    def remove(self, value, yearly: bool = False):
+        key = day_key(value)
+        if yearly:
+            self._yearly.pop((key.month, key.day), None)
+        else:
+            self._days.pop(key, None)
+        self.version += 1
+
+    def clear(self):
+        self._days = {}
+        self._yearly = {}
+        self.version += 1
+
+    # rows are parsed one at a time, a first row whose date does not parse is taken as header
+    def load_csv(self, path, date_column: int = 0, label_column: int = 1, date_format: str = None, delimiter: str = ",", yearly: bool = False):
+        with open(path, newline="", encoding="utf-8") as f:
+            self.add_all(self._read_csv(f, date_column, label_column, date_format, delimiter), yearly)
+        return self
+
+    # UTC times (ending in Z) are converted to tz, the local zone by default, before taking their day
+    def load_ics(self, path, tz=None):
+        with open(path, encoding="utf-8") as f:
+            for key, label, yearly in self._read_ics(f, get_zone(tz) if tz else None):
+                if yearly:
+                    self._yearly[(key.month, key.day)] = label
+                else:
+                    self._days[key] = label
+        self.version += 1
+        return self
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        return cls().load_csv(path, **kwargs)
+
+    @classmethod
+    def from_ics(cls, path, tz=None):
+        return cls().load_ics(path, tz)
+
+    def _read_csv(self, f, date_column, label_column, date_format, delimiter):
+        import csv
+        for n, row in enumerate(csv.reader(f, delimiter=delimiter)):
+            if not row or not row[date_column].strip():
+                continue
+            value = row[date_column].strip()
+            try:
+                key = datetime.strptime(value, date_format).date() if date_format else date.fromisoformat(value[:10])
+            except ValueError:
+                if n == 0:
+                    continue
+                raise
+            label = row[label_column].strip() if label_column is not None and len(row) > label_column else None
+            yield key, label or None
+
+    def _read_ics(self, f, zone):
+        event = None
+        for line in self._unfold(f):
+            name, _, value = line.partition(":")
+            name = name.split(";", 1)[0].upper()
+            if name == "BEGIN" and value.upper() == "VEVENT":
+                event = {}
+            elif name == "END" and value.upper() == "VEVENT":
+                if event and "DTSTART" in event:
+                    # a multi-day event marks every day from DTSTART to DTEND
+                    key = self._ics_day(event["DTSTART"], zone)
+                    last = max(key, self._ics_day(event["DTEND"], zone, True)) if "DTEND" in event else key
+                    yearly = "FREQ=YEARLY" in event.get("RRULE", "").upper()
+                    while key <= last:
+                        yield key, event.get("SUMMARY"), yearly
+                        key += timedelta(days=1)
+                event = None
+            elif event is not None and name in ("DTSTART", "DTEND", "SUMMARY", "RRULE"):
+                event[name] = self._unescape(value) if name == "SUMMARY" else value.strip()
+
+    def _ics_day(self, v, zone, end = False):
+        day = date(int(v[0:4]), int(v[4:6]), int(v[6:8]))
+        if len(v) < 15:
+            # a DTEND date is exclusive
+            return day - timedelta(days=1) if end else day
+        value = datetime(day.year, day.month, day.day, int(v[9:11]), int(v[11:13]), int(v[13:15]))
+        if v.endswith("Z"):
+            value = value.replace(tzinfo=timezone.utc).astimezone(zone)
+        if end:
+            # an event ending at midnight does not cover that day
+            value -= timedelta(microseconds=1)
+        return value.date()
+
+    def _unfold(self, f):
+        current = None
+        for raw in f:
+            raw = raw.rstrip("\r\n")
+            if raw[:1] in (" ", "\t") and current is not None:
+                current += raw[1:]
+                continue
+            if current is not None:
+                yield current
+            current = raw
+        if current is not None:
+            yield current
+
+    def _unescape(self, value):
+        return value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
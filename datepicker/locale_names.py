@@ -0,0 +1,72 @@
+import threading
+from functools import lru_cache
+
+# names are read from the C library once per locale under a lock, the process
+# locale is switched only for that read and restored right after, so rendering
+# never depends on the global locale set by other sessions
+_lock = threading.Lock()
+
+
+class LocaleNames:
+
+    __slots__ = ("locale", "month_names", "month_abbr", "day_names", "day_abbr", "date_format")
+
+    def __init__(self, locale, month_names, month_abbr, day_names, day_abbr, date_format = None):
+        self.locale = locale
+        self.month_names = month_names
+        self.month_abbr = month_abbr
+        self.day_names = day_names
+        self.day_abbr = day_abbr
+        # the locale date pattern (strftime directives), ISO when there is none
+        self.date_format = date_format or "%Y-%m-%d"
+
+    def weekday_labels(self, first_weekday: int = 0, width: int = 2):
+        return _weekday_labels(self, first_weekday, width)
+
+
+@lru_cache(maxsize=256)
+def _weekday_labels(names, first_weekday, width):
+    labels = [d[:width] for d in names.day_abbr]
+    return tuple(labels[first_weekday:] + labels[:first_weekday])
+
+
+# without a locale, or for C/POSIX, the date format is ISO: their %m/%d/%y is
+# not a local convention
+def _read_names(locale, iso: bool = False):
+    import calendar
+    return LocaleNames(
+        locale,
+        tuple(calendar.month_name),
+        tuple(calendar.month_abbr),
+        tuple(calendar.day_name),
+        tuple(calendar.day_abbr),
+        None if iso else _date_format(),
+    )
+
+
+def _date_format():
+    import locale as loc
+    # nl_langinfo is not available on windows
+    if not hasattr(loc, "nl_langinfo"):
+        return None
+    # two digit years are ambiguous when typed, the full year is used instead
+    return loc.nl_langinfo(loc.D_FMT).replace("%y", "%Y") or None
+
+
+@lru_cache(maxsize=64)
+def get_locale_names(locale: str = None) -> LocaleNames:
+    # calendar and locale are only needed the first time names are read
+    import calendar
+    import locale as loc
+    with _lock:
+        if not locale:
+            return _read_names(loc.setlocale(loc.LC_TIME), iso=True)
+
+        error = None
+        for name in (locale, f"{locale}.UTF-8"):
+            try:
+                with calendar.different_locale(name):
+                    return _read_names(locale, locale.split(".")[0].upper() in ("C", "POSIX"))
+            except loc.Error as e:
+                error = e
+        raise error
@@ -0,0 +1,125 @@
+import logging
+import time
+from functools import wraps
+
+logger = logging.getLogger("datepicker")
+
+
+class MetricsCollector:
+
+    def record(self, event: str, duration: float, controls: int = 0) -> None:
+        pass
+
+    def timer(self, event: str, controls: callable = None):
+        return _Timer(self, event, controls)
+
+
+class _Timer:
+
+    __slots__ = ("collector", "event", "controls", "start")
+
+    def __init__(self, collector, event, controls):
+        self.collector = collector
+        self.event = event
+        self.controls = controls
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        self.collector.record(self.event, duration, self.controls() if self.controls else 0)
+        return False
+
+
+class CallbackMetrics(MetricsCollector):
+
+    def __init__(self, callback: callable):
+        self.callback = callback
+
+    def record(self, event: str, duration: float, controls: int = 0) -> None:
+        self.callback(event, duration, controls)
+
+
+class LoggingMetrics(MetricsCollector):
+
+    def __init__(self, level: int = logging.DEBUG):
+        self.level = level
+
+    def record(self, event: str, duration: float, controls: int = 0) -> None:
+        logger.log(self.level, "%s took %.3f ms (%d controls)", event, duration * 1000, controls)
+
+
+class EventStats:
+
+    __slots__ = ("count", "total", "max", "controls")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.controls = 0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class InMemoryMetrics(MetricsCollector):
+
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, event: str, duration: float, controls: int = 0) -> None:
+        stats = self.stats.get(event)
+        if stats is None:
+            stats = self.stats[event] = EventStats()
+        stats.count += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+        stats.controls += controls
+
+    def summary(self):
+        return {
+            event: {"count": s.count, "mean_ms": s.mean * 1000, "max_ms": s.max * 1000, "controls": s.controls}
+            for event, s in self.stats.items()
+        }
+
+    def reset(self):
+        self.stats = {}
+
+
+def as_collector(metrics):
+    if metrics is None or isinstance(metrics, MetricsCollector):
+        return metrics
+    return CallbackMetrics(metrics)
+
+
+def count_controls(controls):
+    count = 0
+    stack = list(controls)
+    while stack:
+        control = stack.pop()
+        count += 1
+        stack.extend(control._get_children())
+    return count
+
+
+# times a DatePicker method when the picker has a collector, by default the
+# reported control count is the number of day cells patched during the call
+def timed(event: str, count: callable = None):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return fn(self, *args, **kwargs)
+            patched = self.patched_cells
+            start = time.perf_counter()
+            result = fn(self, *args, **kwargs)
+            duration = time.perf_counter() - start
+            metrics.record(event, duration, count(self, result) if count else self.patched_cells - patched)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+WEEKEND = 1
+HOLIDAY = 2
+DISABLED = 4
+
+
+@lru_cache(maxsize=256)
+def month_weeks(year, month, first_weekday):
+    import calendar
+    return tuple(tuple(w) for w in calendar.Calendar(first_weekday).monthdatescalendar(year, month))
+
+
+class MonthModel:
+
+    __slots__ = ("year", "month", "weeks", "days", "flags")
+
+    def __init__(self, year, month, first_weekday, day_flags, disabled_mask = None):
+        self.year = year
+        self.month = month
+        self.weeks = month_weeks(year, month, first_weekday)
+        self.days = tuple(d for w in self.weeks for d in w)
+        self.flags = bytearray(day_flags(d) for d in self.days)
+        if disabled_mask:
+            mask = disabled_mask(self.days)
+            i = 0
+            while mask:
+                if mask & 1:
+                    self.flags[i] |= DISABLED
+                mask >>= 1
+                i += 1
+
+    def index(self, d):
+        i = (d - self.days[0]).days
+        return i if 0 <= i < len(self.days) else -1
+
+    @property
+    def weeks_number(self):
+        return len(self.weeks)
+
+
+class MonthModelCache:
+
+    def __init__(self, maxsize: int = 36):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._models = OrderedDict()
+
+    def get(self, year, month, first_weekday, version, day_flags, disabled_mask = None) -> MonthModel:
+        key = (year, month, first_weekday, version)
+        model = self._models.get(key)
+        if model is not None:
+            self.hits += 1
+            self._models.move_to_end(key)
+            return model
+
+        self.misses += 1
+        model = MonthModel(year, month, first_weekday, day_flags, disabled_mask)
+        self._models[key] = model
+        if len(self._models) > self.maxsize:
+            self._models.popitem(last=False)
+        return model
+
+    def clear(self):
+        self._models.clear()
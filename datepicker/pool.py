@@ -0,0 +1,46 @@
+import weakref
+
+from datepicker.datepicker import DatePicker
+
+# one pool per page: fields of a form share a few mounted pickers, each one
+# reset with the field options when acquired instead of building a new tree
+_pools = weakref.WeakKeyDictionary()
+
+
+class DatePickerPool:
+
+    def __init__(self, size: int = 1, **defaults):
+        self.size = size
+        self.defaults = defaults
+        self.created = 0
+        self._free = []
+
+    @classmethod
+    def for_page(cls, page, size: int = 1, **defaults):
+        pool = _pools.get(page)
+        if pool is None:
+            pool = _pools[page] = cls(size, **defaults)
+        return pool
+
+    # options not given get the pool defaults, then the DatePicker defaults
+    def acquire(self, **options) -> DatePicker:
+        options = dict(self.defaults, **options)
+        if self._free:
+            picker = self._free.pop()
+            picker.reset(**options)
+            picker.active = True
+            return picker
+        self.created += 1
+        return DatePicker(**options)
+
+    def release(self, picker: DatePicker):
+        # a released picker stays mounted (e.g. in a closed dialog) but ignores the keyboard
+        picker.active = False
+        if picker not in self._free and len(self._free) < self.size:
+            picker.flush_changes()
+            # a DateField bound to the picker sees the handler gone and lets it go
+            picker.reconfigure(on_select_change=None)
+            self._free.append(picker)
+
+    def __len__(self):
+        return len(self._free)
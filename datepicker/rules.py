@@ -0,0 +1,181 @@
+from datetime import date
+
+from datepicker.selection import day_key
+
+# declarative rules for disabled days. A rule is evaluated once per month over
+# the days shown in the grid and returns an int bitmap, bit i set when days[i]
+# is disabled; the bitmaps of all rules are or-ed into the month model flags
+
+
+def _bits(days, predicate):
+    mask = 0
+    for i, d in enumerate(days):
+        if predicate(d):
+            mask |= 1 << i
+    return mask
+
+
+class Rule:
+
+    # rules depending on the selected hour/minute are recompiled when the time changes
+    time_dependent = False
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        raise NotImplementedError
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+
+class Weekdays(Rule):
+
+    def __init__(self, *weekdays: int):
+        self.weekdays = frozenset(weekdays)
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        if len(days) % 7:
+            return _bits(days, lambda d: d.weekday() in self.weekdays)
+        # the grid is made of whole weeks, one column per weekday
+        columns = [i for i in range(7) if days[i].weekday() in self.weekdays]
+        mask = 0
+        for w in range(len(days) // 7):
+            for i in columns:
+                mask |= 1 << (w * 7 + i)
+        return mask
+
+
+class Weekends(Weekdays):
+
+    def __init__(self):
+        super().__init__(5, 6)
+
+
+class NthWeekday(Rule):
+
+    # nths are 1 based, negative values count from the end of the month (-1 is the last)
+    def __init__(self, weekday: int, *nths: int):
+        self.weekday = weekday
+        self.nths = frozenset(nths)
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        return _bits(days, self._matches)
+
+    def _matches(self, d):
+        if d.weekday() != self.weekday:
+            return False
+        if (d.day - 1) // 7 + 1 in self.nths:
+            return True
+        if any(n < 0 for n in self.nths):
+            days_in_month = (date(d.year + d.month // 12, d.month % 12 + 1, 1) - date(d.year, d.month, 1)).days
+            return -((days_in_month - d.day) // 7 + 1) in self.nths
+        return False
+
+
+class Dates(Rule):
+
+    def __init__(self, dates):
+        self.dates = frozenset(day_key(d) for d in dates)
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        dates = self.dates
+        return _bits(days, lambda d: d in dates)
+
+
+class Before(Rule):
+
+    def __init__(self, value):
+        self.day = day_key(value)
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        # days are sorted, so the matching days are a prefix of the grid
+        n = sum(1 for d in days if d < self.day)
+        return (1 << n) - 1
+
+
+class After(Rule):
+
+    def __init__(self, value):
+        self.day = day_key(value)
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        n = sum(1 for d in days if d > self.day)
+        return ((1 << n) - 1) << (len(days) - n)
+
+
+class HourWindow(Rule):
+
+    time_dependent = True
+
+    # windows maps a weekday to a (start, end) pair of "HH:MM" strings or (hour, minute)
+    # tuples, a day is disabled when the selected time is outside its window;
+    # weekdays without a window are disabled unless default_open is set
+    def __init__(self, windows: dict, default_open: bool = True):
+        self.windows = {wd: (self._minutes(s), self._minutes(e)) for wd, (s, e) in windows.items()}
+        self.default_open = default_open
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        t = hour * 60 + minute
+        closed = set()
+        for wd in range(7):
+            window = self.windows.get(wd)
+            if window is None:
+                if not self.default_open:
+                    closed.add(wd)
+            elif not window[0] <= t <= window[1]:
+                closed.add(wd)
+        return Weekdays(*closed).mask(days) if closed else 0
+
+    @staticmethod
+    def _minutes(value):
+        if isinstance(value, str):
+            h, m = value.split(":")
+            return int(h) * 60 + int(m)
+        return value[0] * 60 + value[1]
+
+
+class AnyOf(Rule):
+
+    def __init__(self, *rules: Rule):
+        self.rules = rules
+        self.time_dependent = any(r.time_dependent for r in rules)
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        mask = 0
+        for rule in self.rules:
+            mask |= rule.mask(days, hour, minute)
+        return mask
+
+
+class Not(Rule):
+
+    def __init__(self, rule: Rule):
+        self.rule = rule
+        self.time_dependent = rule.time_dependent
+
+    def mask(self, days, hour: int = 0, minute: int = 0) -> int:
+        return ~self.rule.mask(days, hour, minute) & ((1 << len(days)) - 1)
+
+
+# disables every day that does not match the rule, e.g. Only(NthWeekday(1, 1, 3))
+Only = Not
+
+
+def compile_rules(rules) -> Rule | None:
+    if not rules:
+        return None
+    if isinstance(rules, Rule):
+        return rules
+    return AnyOf(*rules)
+
+
+# the rule without its time-dependent parts, for pickers without hour/minute:
+# there is no selected time to check, so those parts leave their days open
+def date_only(rule: Rule | None) -> Rule | None:
+    if rule is None or not rule.time_dependent:
+        return rule
+    if isinstance(rule, AnyOf):
+        return compile_rules([r for r in map(date_only, rule.rules) if r is not None])
+    return None
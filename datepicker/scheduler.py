@@ -0,0 +1,74 @@
+import threading
+
+
+# coalesces render requests: requests arriving within `delay` seconds, or while
+# a render is still in flight, are served by a single render
+class UpdateScheduler:
+
+    def __init__(self, render: callable, delay: float = 0):
+        self.render = render
+        self.delay = delay
+        self.renders = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending = False
+        self._in_flight = False
+
+    def request(self, delay: float = None):
+        delay = self.delay if delay is None else delay
+        with self._lock:
+            self.requests += 1
+            self._pending = True
+            if self._in_flight or self._timer is not None:
+                return
+            if delay > 0:
+                self._timer = threading.Timer(delay, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+            self._in_flight = True
+            self._pending = False
+        self._render()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._in_flight or not self._pending:
+                return
+            self._in_flight = True
+            self._pending = False
+        self._render()
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = False
+
+    def _run(self):
+        with self._lock:
+            self._timer = None
+            if self._in_flight or not self._pending:
+                return
+            self._in_flight = True
+            self._pending = False
+        self._render()
+
+    def _render(self):
+        again = True
+        while again:
+            try:
+                self.renders += 1
+                self.render()
+            except BaseException:
+                with self._lock:
+                    self._in_flight = False
+                raise
+            with self._lock:
+                again = self._pending
+                self._pending = False
+                self._in_flight = again
@@ -0,0 +1,187 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from datepicker.selection_type import SelectionType
+
+
+def day_key(value):
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class Selection:
+
+    def __init__(self, values=None):
+        self._values = {}
+        # a ChangeBatch recording the added/removed values, see DatePicker.on_select_change
+        self.changes = None
+        # held while the selection changes, a snapshot taken from another thread
+        # (e.g. by a delayed selection change event) never sees half a change
+        self.lock = threading.Lock()
+        for v in values or []:
+            self._select(v)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self.values())
+
+    def __contains__(self, value):
+        return day_key(value) in self._values
+
+    def values(self):
+        return list(self._values.values())
+
+    def snapshot(self) -> tuple:
+        with self.lock:
+            return tuple(self.values())
+
+    def clear(self):
+        with self.lock:
+            self._clear()
+
+    def select(self, value) -> bool:
+        with self.lock:
+            return self._select(value)
+
+    def _clear(self):
+        if self.changes is not None:
+            for key, value in self._values.items():
+                self.changes.remove(key, value)
+        self._values = {}
+
+    def _select(self, value) -> bool:
+        raise NotImplementedError
+
+    def _add(self, key, value):
+        self._values[key] = value
+        if self.changes is not None:
+            self.changes.add(key, value)
+
+    def _remove(self, key):
+        value = self._values.pop(key)
+        if self.changes is not None:
+            self.changes.remove(key, value)
+
+    @staticmethod
+    def create(selection_type: SelectionType, values=None, multiple_ranges: bool = False):
+        if selection_type == SelectionType.RANGE:
+            return RangeSelection(values, multiple_ranges)
+        if selection_type == SelectionType.MULTIPLE:
+            return MultipleSelection(values)
+        return SingleSelection(values)
+
+
+class SingleSelection(Selection):
+
+    def _select(self, value) -> bool:
+        key = day_key(value)
+        selected = key in self._values
+        self._clear()
+        if not selected:
+            self._add(key, value)
+        return True
+
+
+class MultipleSelection(Selection):
+
+    def _select(self, value) -> bool:
+        key = day_key(value)
+        if key in self._values:
+            self._remove(key)
+        else:
+            self._add(key, value)
+        return True
+
+
+# ranges are kept as two parallel sorted lists of start and end days,
+# disjoint, so containment is a bisect over the starts
+class RangeSelection(Selection):
+
+    def __init__(self, values=None, multiple_ranges: bool = False):
+        self.multiple_ranges = multiple_ranges
+        self._starts = []
+        self._ends = []
+        self._pending = None
+        super().__init__(values)
+
+    def __contains__(self, value):
+        return self.is_endpoint(value) or self.is_inside(value)
+
+    def values(self):
+        result = []
+        for s, e in zip(self._starts, self._ends):
+            result.append(self._values[s])
+            result.append(self._values[e])
+        if self._pending is not None:
+            result.append(self._values[self._pending])
+        return result
+
+    def ranges(self):
+        return [(self._values[s], self._values[e]) for s, e in zip(self._starts, self._ends)]
+
+    # the start of a range waiting for its end, None when there is none
+    @property
+    def pending(self):
+        return None if self._pending is None else self._values[self._pending]
+
+    def _clear(self):
+        super()._clear()
+        self._starts = []
+        self._ends = []
+        self._pending = None
+
+    def is_endpoint(self, value) -> bool:
+        return day_key(value) in self._values
+
+    def is_inside(self, value) -> bool:
+        key = day_key(value)
+        i = bisect_right(self._starts, key) - 1
+        return i >= 0 and self._starts[i] < key < self._ends[i]
+
+    def range_index(self, value) -> int:
+        key = day_key(value)
+        i = bisect_right(self._starts, key) - 1
+        if i >= 0 and key <= self._ends[i]:
+            return i
+        return -1
+
+    def overlaps(self, start, end) -> bool:
+        i = bisect_left(self._ends, day_key(start))
+        return i < len(self._starts) and self._starts[i] <= day_key(end)
+
+    def _select(self, value) -> bool:
+        key = day_key(value)
+
+        if self._pending is not None:
+            if key == self._pending:
+                self._remove(self._pending)
+                self._pending = None
+                return True
+            if key < self._pending:
+                return False
+            if self.overlaps(self._pending, key):
+                return False
+            start = self._pending
+            self._pending = None
+            self._add(key, value)
+            i = bisect_left(self._starts, start)
+            self._starts.insert(i, start)
+            self._ends.insert(i, key)
+            return True
+
+        if self._starts and not self.multiple_ranges:
+            self._clear()
+        elif self.multiple_ranges:
+            i = self.range_index(key)
+            if i >= 0:
+                self._remove(self._starts.pop(i))
+                self._remove(self._ends.pop(i))
+                return True
+
+        self._pending = key
+        self._add(key, value)
+        return True
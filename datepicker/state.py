@@ -0,0 +1,185 @@
+import json
+import threading
+from datetime import date
+
+from datepicker.selection import day_key
+from datepicker.selection_type import SelectionType
+
+# picker state is encoded as compact json: days are ordinals, sorted and
+# run-length compressed as [start, length, gap, length, ...], so a large
+# MULTIPLE selection of consecutive days takes a few bytes. The times of the
+# selected values are compressed as [minutes, count, ...] repeats. Holidays,
+# rules and providers are not part of the state, the restoring picker is
+# created with the same ones.
+
+# version 1 stored one minutes value per selected day
+STATE_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+
+
+def encode_runs(ordinals):
+    runs = []
+    end = None
+    for o in ordinals:
+        if end is not None and o == end + 1:
+            runs[-1] += 1
+        else:
+            runs += [o if end is None else o - end - 1, 1]
+        end = o
+    return runs
+
+
+def decode_runs(runs):
+    ordinals = []
+    end = None
+    for i in range(0, len(runs), 2):
+        start = runs[i] if end is None else end + 1 + runs[i]
+        ordinals.extend(range(start, start + runs[i + 1]))
+        end = start + runs[i + 1] - 1
+    return ordinals
+
+
+def encode_repeats(values):
+    repeats = []
+    for v in values:
+        if repeats and repeats[-2] == v:
+            repeats[-1] += 1
+        else:
+            repeats += [v, 1]
+    return repeats
+
+
+def decode_repeats(repeats):
+    values = []
+    for i in range(0, len(repeats), 2):
+        values.extend([repeats[i]] * repeats[i + 1])
+    return values
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute if hasattr(value, "hour") else 0
+
+
+def encode_state(engine) -> dict:
+    selection = engine.selection
+    state = {
+        "v": STATE_VERSION,
+        "t": engine.selection_type.value,
+        "ym": [engine.yy, engine.mm],
+        "hm": [engine.hour, engine.minute],
+        "o": [
+            engine.first_weekday,
+            int(engine.hour_minute),
+            int(engine.hide_prev_next_month_days),
+            int(getattr(selection, "multiple_ranges", False)),
+            engine.disable_to and engine.day(engine.disable_to).toordinal(),
+            engine.disable_from and engine.day(engine.disable_from).toordinal(),
+        ],
+    }
+
+    if engine.selection_type == SelectionType.RANGE:
+        values = [v for r in selection.ranges() for v in r]
+        # ranges are sorted and disjoint, start/end pairs are stored as deltas
+        flat = []
+        last = 0
+        for v in values:
+            o = day_key(v).toordinal()
+            flat.append(o - last)
+            last = o
+        state["r"] = flat
+        pending = selection.pending
+        if pending is not None:
+            values.append(pending)
+            state["p"] = day_key(pending).toordinal()
+    else:
+        values = sorted(selection.values(), key=day_key)
+        state["s"] = encode_runs([day_key(v).toordinal() for v in values])
+
+    if engine.hour_minute and values:
+        minutes = [_minutes(v) for v in values]
+        repeats = encode_repeats(minutes)
+        # a single value when every selected day has the same time
+        state["m"] = repeats[0] if len(repeats) == 2 else repeats
+    return state
+
+
+def decode_values(state) -> list[tuple[date, int]]:
+    if "r" in state:
+        ordinals = []
+        last = 0
+        for delta in state["r"]:
+            last += delta
+            ordinals.append(last)
+        if "p" in state:
+            ordinals.append(state["p"])
+    else:
+        ordinals = decode_runs(state.get("s", []))
+
+    minutes = state.get("m", 0)
+    if isinstance(minutes, int):
+        minutes = [minutes] * len(ordinals)
+    elif state.get("v", STATE_VERSION) > 1:
+        minutes = decode_repeats(minutes)
+    return [(date.fromordinal(o), m) for o, m in zip(ordinals, minutes)]
+
+
+# options shaping the layout (first_weekday, hour_minute) can be skipped when
+# restoring into a picker that is already built
+def restore_state(engine, state: dict, options: bool = True):
+    if state.get("v") not in SUPPORTED_VERSIONS:
+        raise ValueError(f"unsupported state version {state.get('v')!r}")
+
+    first_weekday, hour_minute, hide, multiple_ranges, disable_to, disable_from = state["o"]
+    if options:
+        engine.first_weekday = first_weekday
+        engine.hour_minute = bool(hour_minute)
+    engine.hide_prev_next_month_days = bool(hide)
+    engine.disable_to = engine.cell_value(date.fromordinal(disable_to), 0, 0) if disable_to else None
+    engine.disable_from = engine.cell_value(date.fromordinal(disable_from), 0, 0) if disable_from else None
+
+    values = [engine.cell_value(d, m // 60, m % 60) for d, m in decode_values(state)]
+    # ranges are replayed as start/end clicks, the pending start last
+    engine.set_selection(state["t"], values, bool(multiple_ranges))
+    engine.jump_to(*state["ym"])
+    engine.set_time(*state["hm"])
+    engine.invalidate()
+
+
+def dumps(engine) -> bytes:
+    return json.dumps(encode_state(engine), separators=(",", ":")).encode()
+
+
+def loads(engine, data: bytes | str, options: bool = True):
+    restore_state(engine, json.loads(data), options)
+
+
+class StateStore:
+
+    # a local key-value file store (dbm) of encoded states, e.g. keyed by session id
+    def __init__(self, path: str):
+        import dbm
+        self._db = dbm.open(path, "c")
+        self._lock = threading.Lock()
+
+    def save(self, key: str, data: bytes):
+        with self._lock:
+            self._db[key] = data
+
+    def load(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._db.get(key)
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._db:
+                del self._db[key]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
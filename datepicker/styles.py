@@ -0,0 +1,41 @@
+from functools import lru_cache
+
+import flet as ft
+
+# styles are immutable once created, so a single instance is shared
+# by every cell of every DatePicker in the process
+
+CELL_RADIUS = 20
+TODAY_BORDER = ft.BorderSide(2, ft.colors.BLUE)
+FOCUS_BORDER = ft.BorderSide(2, ft.colors.ORANGE_400)
+CELL_SHAPE = {
+    ft.MaterialState.DEFAULT: ft.RoundedRectangleBorder(radius=CELL_RADIUS),
+}
+
+
+@lru_cache(maxsize=None)
+def day_style(color, bgcolor, today: bool = False, focused: bool = False) -> ft.ButtonStyle:
+    return ft.ButtonStyle(
+        color=color,
+        bgcolor=bgcolor,
+        padding=0,
+        shape=CELL_SHAPE,
+        side=FOCUS_BORDER if focused else TODAY_BORDER if today else None
+    )
+
+
+@lru_cache(maxsize=None)
+def label_style(color=ft.colors.BLACK, bgcolor=ft.colors.GREY_300) -> ft.ButtonStyle:
+    return ft.ButtonStyle(
+        padding=0,
+        color=color,
+        bgcolor=bgcolor,
+        shape=CELL_SHAPE
+    )
+
+
+def cache_info():
+    return {
+        "day_style": day_style.cache_info(),
+        "label_style": label_style.cache_info(),
+    }
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# a calendar month only crosses a DST transition once or twice a year, so the
+# transition days are found once per (zone, month) and per-cell datetimes are built
+# directly, resolving wall times only on the transition days
+
+_ONE_DAY = timedelta(days=1)
+
+
+@lru_cache(maxsize=64)
+def get_zone(tz):
+    # a zone name is resolved with zoneinfo (system tz database or the tzdata package)
+    if not isinstance(tz, str):
+        return tz
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(tz)
+
+
+class MonthOffsets:
+
+    __slots__ = ("zone", "year", "month", "transitions")
+
+    def __init__(self, zone, year, month):
+        self.zone = zone
+        self.year = year
+        self.month = month
+        # days (1 based) during which the offset changes, from the utc offsets at
+        # local midnight of every day and of the day after the last one
+        first = datetime(year, month, 1)
+        days = (datetime(year + month // 12, month % 12 + 1, 1) - first).days
+        offsets = [(first + _ONE_DAY * i).replace(tzinfo=zone).utcoffset() for i in range(0, days + 1)]
+        self.transitions = frozenset(i + 1 for i in range(0, days) if offsets[i] != offsets[i + 1])
+
+    def local(self, day, hour = 0, minute = 0) -> datetime:
+        value = datetime(self.year, self.month, day, hour, minute, tzinfo=self.zone)
+        if day in self.transitions:
+            # a wall time in a DST gap does not exist, it is moved forward by the
+            # gap length; an ambiguous one keeps its first occurrence (fold=0)
+            value = value.astimezone(timezone.utc).astimezone(self.zone)
+        return value
+
+
+@lru_cache(maxsize=256)
+def month_offsets(zone, year, month) -> MonthOffsets:
+    return MonthOffsets(zone, year, month)
+
+
+def to_zone(value, zone):
+    # aware values are converted to the zone, naive ones are taken as local to it
+    if not isinstance(value, datetime):
+        return value
+    if value.tzinfo is None:
+        return value.replace(tzinfo=zone)
+    return value.astimezone(zone)
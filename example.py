@@ -1,5 +1,7 @@
 import flet as ft
-from datepicker.datepicker import DatePicker
+from datepicker.date_field import DateField
+from datepicker.formats import get_format
+from datepicker.pool import DatePickerPool
 from datepicker.selection_type import SelectionType
 from datetime import datetime
 
@@ -12,6 +14,8 @@ class Example(ft.UserControl):
         self.holidays = [datetime(2023, 4, 25), datetime(2023, 5, 1), datetime(2023, 6, 2)]
         self.locales = ["en_US", "fr_FR", "it_IT", "es_ES"]
         self.selected_locale = None
+        # iso strings of the MULTIPLE selection, updated from the change deltas
+        self.selected_iso = {}
 
         self.locales_opts = []
         for l in self.locales:
@@ -33,7 +37,7 @@ class Example(ft.UserControl):
             content_padding=0
         )
 
-        self.tf = ft.TextField(label="Select Date", dense=True, hint_text="yyyy-mm-ddThh:mm:ss", width=260, height=40)
+        self.date_field = DateField(label="Select Date", width=260)
         self.cal_ico = ft.TextButton(
             icon=ft.icons.CALENDAR_MONTH, 
             on_click=self.open_dlg_modal, 
@@ -49,7 +53,7 @@ class Example(ft.UserControl):
 
         self.st = ft.Stack(
             [
-                self.tf,
+                self.date_field,
                 self.cal_ico,
             ]
         )
@@ -97,27 +101,38 @@ class Example(ft.UserControl):
     
     def confirm_dlg(self, e):
         self.dlg_modal.open = False
+        self.pool.release(self.datepicker)
         self.update()
         self.page.update()
     
-    def update_result(self, selected_data):
-        if int(self.cg.value) == SelectionType.SINGLE.value:
-            self.tf.value = selected_data[0] if len(selected_data) > 0 else None
-        elif int(self.cg.value) == SelectionType.MULTIPLE.value and len(selected_data) > 0:
-            self.from_to_text.value = f"{[d.isoformat() for d in selected_data]}"
-            self.from_to_text.visible = True
-        elif int(self.cg.value) == SelectionType.RANGE.value and len(selected_data) == 2:
+    def update_result(self, change):
+        # the SINGLE selection is written to the date field by the field itself
+        if int(self.cg.value) == SelectionType.MULTIPLE.value:
+            for d in change.removed:
+                self.selected_iso.pop(d.date(), None)
+            for d in change.added:
+                self.selected_iso[d.date()] = d.isoformat()
+            self.from_to_text.value = f"{list(self.selected_iso.values())}"
+            self.from_to_text.visible = len(self.selected_iso) > 0
+        elif int(self.cg.value) == SelectionType.RANGE.value and len(change.selected) == 2:
+            selected_data = change.selected
             self.from_to_text.value = f"From: {selected_data[0]} To: {selected_data[1]}"
             self.from_to_text.visible = True
     
     def cancel_dlg(self, e):
         self.dlg_modal.open = False
+        self.pool.release(self.datepicker)
         self.page.update()
 
+    @property
+    def pool(self):
+        # the dialog reuses one mounted picker per page, reset with the current options
+        return DatePickerPool.for_page(self.page)
+
     def open_dlg_modal(self, e):
-        self.datepicker = DatePicker(
+        self.datepicker = self.pool.acquire(
             hour_minute=self.c1.value,
-            selected_date=[self.tf.value] if self.tf.value else None,
+            selected_date=[self.date_field.value] if self.date_field.value else None,
             selection_type=int(self.cg.value),
             disable_to=self._to_datetime(self.tf1.value),
             disable_from=self._to_datetime(self.tf2.value),
@@ -125,18 +140,17 @@ class Example(ft.UserControl):
             holidays=self.holidays,
             show_three_months=self.c3.value,
             locale=self.selected_locale,
-            on_change=self.update_result
+            on_select_change=self.update_result
             )
+        self.selected_iso = {}
+        self.date_field.bind(self.datepicker)
         self.page.dialog = self.dlg_modal
         self.dlg_modal.content = self.datepicker
         self.dlg_modal.open = True
         self.page.update()
 
     def _to_datetime(self, date_str=None):
-        if date_str:
-            return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        else:
-            return None
+        return get_format("%Y-%m-%d %H:%M:%S").parse(date_str) if date_str else None
         
     def set_locale(self, e):
         self.selected_locale = self.dd.value if self.dd.value else None
\ No newline at end of file
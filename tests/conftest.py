@@ -0,0 +1,53 @@
+import flet as ft
+import pytest
+from flet_core.connection import Connection
+from flet_core.protocol import PageCommandsBatchResponsePayload
+
+# a real flet Page on a connection recording the command batches, so controls
+# are mounted and updated as with a client, without one
+
+
+class RecordingConnection(Connection):
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self._next_id = 0
+
+    def send_commands(self, session_id, commands):
+        self.batches.append(commands)
+        results = []
+        for command in commands:
+            if command.name == "add":
+                ids = []
+                for _ in command.commands:
+                    self._next_id += 1
+                    ids.append(f"_{self._next_id}")
+                results.append(" ".join(ids))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def last(self, name=None):
+        commands = self.batches[-1] if self.batches else []
+        return [c for c in commands if name is None or c.name == name]
+
+
+@pytest.fixture
+def conn():
+    return RecordingConnection()
+
+
+@pytest.fixture
+def page(conn):
+    return ft.Page(conn, "test")
+
+
+def event(control, name="click", data=None):
+    return ft.ControlEvent(target=control.uid, name=name, data=data, control=control, page=control.page)
+
+
+def click(control):
+    control.on_click(event(control))
+
+
+def key(name, shift=False):
+    return ft.KeyboardEvent(key=name, shift=shift, ctrl=False, alt=False, meta=False)
@@ -0,0 +1,88 @@
+import threading
+from datetime import date, datetime
+
+from datepicker.availability import AvailabilityCache, StaticAvailabilityProvider
+from datepicker.engine import CalendarEngine
+from datepicker.month_model import DISABLED
+
+
+def loaded(cache):
+    done = threading.Event()
+    cache.add_listener(lambda year, month: done.set())
+    return done
+
+
+def test_cache_loads_in_the_background():
+    provider = StaticAvailabilityProvider([date(2023, 5, 10), date(2023, 6, 1)])
+    cache = AvailabilityCache(provider)
+    done = loaded(cache)
+    assert cache.get(2023, 5) is None
+    assert done.wait(1)
+    assert cache.get(2023, 5) == frozenset([date(2023, 5, 10)])
+    assert cache.is_unavailable(datetime(2023, 5, 10, 12, 0))
+    assert not cache.is_unavailable(date(2023, 6, 1))
+    assert provider.calls == 1
+
+
+def test_stale_months_are_served_while_refreshing():
+    days = {date(2023, 5, 10)}
+    cache = AvailabilityCache(StaticAvailabilityProvider(lambda y, m: list(days)), ttl=0)
+    done = loaded(cache)
+    cache.get(2023, 5)
+    assert done.wait(1)
+    done.clear()
+    days.add(date(2023, 5, 11))
+    version = cache.version
+    assert cache.get(2023, 5) == frozenset([date(2023, 5, 10)])
+    assert done.wait(1)
+    assert cache.version > version
+    assert cache.is_unavailable(date(2023, 5, 11))
+
+
+def test_failed_fetch_is_retried():
+    calls = []
+
+    def unavailable(year, month):
+        calls.append(month)
+        if len(calls) == 1:
+            raise OSError("offline")
+        return []
+
+    cache = AvailabilityCache(StaticAvailabilityProvider(unavailable))
+    done = loaded(cache)
+    cache.get(2023, 5)
+    while len(calls) < 2:
+        cache.get(2023, 5)
+    assert done.wait(1)
+    assert cache.get(2023, 5) == frozenset()
+
+
+def test_engine_disables_unavailable_days():
+    cache = AvailabilityCache(StaticAvailabilityProvider([date(2023, 5, 10)]))
+    done = loaded(cache)
+    e = CalendarEngine(now=datetime(2023, 5, 15), availability=cache)
+    e.month_state(2023, 5)
+    assert done.wait(1)
+    state = e.month_state(2023, 5)
+    assert dict(zip(state.days, state.states))[date(2023, 5, 10)] & DISABLED
+    assert e.is_disabled(date(2023, 5, 10))
+
+
+def test_loading_a_month_keeps_the_models_of_the_other_months():
+    cache = AvailabilityCache(StaticAvailabilityProvider([date(2023, 5, 10), date(2023, 6, 1)]))
+    done = loaded(cache)
+    e = CalendarEngine(now=datetime(2023, 5, 15), availability=cache)
+    e.month_model(2023, 5)
+    assert done.wait(1)
+    done.clear()
+    may = e.month_model(2023, 5)
+    e.month_model(2023, 12)
+    assert done.wait(1)
+    done.clear()
+    assert e.month_model(2023, 5) is may
+    # the May grid ends on June 4th, so June data changes it
+    e.month_model(2023, 6)
+    assert done.wait(1)
+    may_with_june = e.month_model(2023, 5)
+    assert may_with_june is not may
+    assert may_with_june.flags[may_with_june.index(date(2023, 6, 1))] & DISABLED
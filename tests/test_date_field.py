@@ -0,0 +1,91 @@
+from datetime import datetime
+
+from datepicker.date_field import DateField
+from datepicker.datepicker import DatePicker
+from datepicker.pool import DatePickerPool
+from tests.conftest import click, event, key
+
+
+def setup(page, **kwargs):
+    picker = DatePicker(disable_from=datetime(2023, 6, 20), **kwargs)
+    picker.engine.jump_to(2023, 5)
+    field = DateField(picker, pattern="%Y-%m-%d")
+    page.add(field, picker)
+    return field, picker
+
+
+def submit(field, text):
+    field.text_field.value = text
+    field._on_text_submit(event(field.text_field, "submit"))
+
+
+def test_typed_date_selects_in_the_picker(page, conn):
+    field, picker = setup(page)
+    submit(field, "2023-05-10")
+    assert field.value == datetime(2023, 5, 10)
+    assert picker.selected == [datetime(2023, 5, 10)]
+    assert not conn.last("add")
+    submit(field, "2023-06-02")
+    assert (picker.yy, picker.mm) == (2023, 6)
+    assert picker.selected == [datetime(2023, 6, 2)]
+
+
+def test_invalid_and_disabled_dates_are_refused(page):
+    field, picker = setup(page)
+    submit(field, "2023-02-30")
+    assert field.text_field.error_text == DateField.INVALID
+    submit(field, "2023-06-25")
+    assert field.text_field.error_text == DateField.DISABLED
+    assert field.value is None and picker.selected == []
+
+
+def test_picker_selection_updates_the_field(page):
+    changes = []
+    field, picker = setup(page, on_select_change=changes.append)
+    day = next(c for c in picker.month_views[0].cells if c.data == datetime(2023, 5, 12))
+    click(day)
+    assert field.text_field.value == "2023-05-12"
+    assert field.value == datetime(2023, 5, 12)
+    # the handler set on the picker before binding is still called
+    assert len(changes) == 1
+    field.unbind()
+    assert picker.on_select_change == changes.append
+
+
+def test_picker_ignores_keys_while_the_date_is_typed(page):
+    field, picker = setup(page, keyboard=True)
+    field._on_text_focus(event(field.text_field, "focus"))
+    picker._on_keyboard(key("Arrow Right"))
+    assert picker.engine.focus is None
+    field.text_field.value = ""
+    field._on_text_submit(event(field.text_field, "blur"))
+    picker._on_keyboard(key("Arrow Right"))
+    assert picker.engine.focus is not None
+
+
+def test_default_pattern_follows_the_picker(page):
+    picker = DatePicker(locale="C", hour_minute=True)
+    field = DateField(picker)
+    page.add(field, picker)
+    assert field.format.pattern == "%Y-%m-%d %H:%M"
+    assert field.text_field.hint_text == "yyyy-mm-dd hh:mm"
+
+
+def test_released_picker_is_no_longer_driven_by_its_old_field(page):
+    pool = DatePickerPool()
+    picker = pool.acquire()
+    first = DateField(picker, pattern="%Y-%m-%d")
+    page.add(first, picker)
+    submit(first, "2023-05-10")
+    pool.release(picker)
+
+    again = pool.acquire()
+    second = DateField(again, pattern="%Y-%m-%d")
+    page.add(second)
+    submit(first, "2023-05-11")
+    assert first.picker is None
+    assert again.selected == []
+    first.unbind()
+    assert again.on_select_change == second._on_picker_change
+    submit(second, "2023-05-12")
+    assert again.selected == [datetime(2023, 5, 12)]
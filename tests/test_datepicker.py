@@ -0,0 +1,406 @@
+import locale as loc
+import threading
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import flet as ft
+import pytest
+
+from datepicker.availability import AvailabilityCache, StaticAvailabilityProvider
+from datepicker.datepicker import DatePicker
+from datepicker.decorators import DayValues
+from datepicker.holidays import HolidayCalendar
+from datepicker.metrics import InMemoryMetrics
+from datepicker.selection_type import SelectionType
+from tests.conftest import click, event, key
+
+
+def mounted(page, **kwargs):
+    picker = DatePicker(**kwargs)
+    picker.now = datetime(2023, 5, 15)
+    picker.yy, picker.mm = 2023, 5
+    page.add(picker)
+    return picker
+
+
+def cell(picker, day, view=0):
+    return next(c for c in picker.month_views[view].cells if c.data and c.data.month == picker.mm and c.data.day == day)
+
+
+def navigate(picker, data):
+    picker._adjust_calendar(event(ft.IconButton(data=data)))
+
+
+def test_grid_has_the_max_number_of_weeks(page):
+    picker = mounted(page, show_three_months=True)
+    assert len(picker.month_views) == 3
+    assert all(len(view.cells) == 7 * DatePicker.MAX_WEEKS for view in picker.month_views)
+
+
+def test_select_patches_cells_in_place(page, conn):
+    picker = mounted(page)
+    cells = list(picker.month_views[0].cells)
+    click(cell(picker, 10))
+    assert picker.selected == [datetime(2023, 5, 10)]
+    assert picker.month_views[0].cells == cells
+    # only the selected cell changed
+    assert [c.name for c in conn.last()] == ["set"]
+
+
+def test_navigation_patches_cells_in_place(page, conn):
+    picker = mounted(page)
+    cells = list(picker.month_views[0].cells)
+    navigate(picker, DatePicker.NEXT_MONTH)
+    assert (picker.yy, picker.mm) == (2023, 6)
+    assert picker.month_views[0].cells == cells
+    assert conn.last() and not conn.last("add") and not conn.last("remove")
+    assert picker.month_views[0].cells[0].data == datetime(2023, 5, 29)
+
+
+def test_unchanged_render_sends_nothing(page, conn):
+    picker = mounted(page, selection_type=SelectionType.MULTIPLE)
+    picker._update_calendar()
+    assert conn.last() == []
+
+
+def test_range_selection_marks_the_days_between(page):
+    picker = mounted(page, selection_type=SelectionType.RANGE)
+    click(cell(picker, 10))
+    click(cell(picker, 14))
+    assert picker.selected == [datetime(2023, 5, 10), datetime(2023, 5, 14)]
+    inside = cell(picker, 12).style.bgcolor
+    assert inside != cell(picker, 20).style.bgcolor
+    assert inside != cell(picker, 10).style.bgcolor
+
+
+def test_assigning_the_selection_renders_it(page):
+    picker = mounted(page, selection_type=SelectionType.MULTIPLE)
+    unselected = cell(picker, 3).style.bgcolor
+    picker.selected = [datetime(2023, 5, 3), datetime(2023, 5, 9)]
+    assert picker.selected == [datetime(2023, 5, 3), datetime(2023, 5, 9)]
+    assert cell(picker, 3).style.bgcolor != unselected
+    picker.selected = []
+    assert picker.selected == []
+    assert cell(picker, 3).style.bgcolor == unselected
+
+
+def test_assigning_the_selection_type_replaces_the_selection(page):
+    picker = mounted(page)
+    picker.selection_type = SelectionType.RANGE
+    assert picker.selection_type == SelectionType.RANGE
+    click(cell(picker, 10))
+    click(cell(picker, 14))
+    assert picker.selected == [datetime(2023, 5, 10), datetime(2023, 5, 14)]
+    assert cell(picker, 12).style.bgcolor != cell(picker, 20).style.bgcolor
+
+
+def test_holiday_calendar_is_shared(page):
+    calendar = HolidayCalendar([(datetime(2023, 5, 2), "Holiday")])
+    first, second = mounted(page, holidays=calendar), mounted(page, holidays=calendar)
+    assert first.holidays is second.holidays is calendar
+    assert cell(first, 2).tooltip == "Holiday"
+
+
+def test_styles_are_shared_between_pickers(page):
+    first, second = mounted(page), mounted(page)
+    assert cell(first, 10).style is cell(second, 10).style
+    assert cell(first, 10).style is cell(first, 11).style
+
+
+def test_locale_is_per_instance(page):
+    before = loc.setlocale(loc.LC_ALL)
+    picker = mounted(page, locale="C")
+    assert picker.month_views[0].month_text.value == "May"
+    assert loc.setlocale(loc.LC_ALL) == before
+
+
+def test_scroll_recycles_the_month_pool(page, conn):
+    picker = mounted(page, scroll_months=24)
+    pool = list(picker.month_views)
+    assert len(pool) == DatePicker.SCROLL_VISIBLE_MONTHS + 2 * DatePicker.SCROLL_BUFFER_MONTHS
+    picker._on_months_scroll(SimpleNamespace(pixels=10.5 * DatePicker.MONTH_EXTENT))
+    assert picker.month_views == pool
+    assert sorted(v.index for v in pool) == [9, 10, 11, 12]
+    assert conn.last() and not conn.last("add") and not conn.last("remove")
+    view = next(v for v in pool if v.index == 10)
+    assert view.container.top == 10 * DatePicker.MONTH_EXTENT
+    assert view.cells[0].data == datetime(2024, 2, 26)
+    assert picker.scroll_header.month_text.value == "March"
+
+    # the last months do not move the pool past the end of the list
+    picker._on_months_scroll(SimpleNamespace(pixels=30 * DatePicker.MONTH_EXTENT))
+    assert sorted(v.index for v in pool) == [20, 21, 22, 23]
+
+
+def test_metrics_count_the_patched_cells(page, capsys):
+    metrics = InMemoryMetrics()
+    picker = mounted(page, metrics=metrics)
+    click(cell(picker, 10))
+    stats = metrics.summary()
+    assert stats["create_layout"]["controls"] > 7 * DatePicker.MAX_WEEKS
+    assert stats["select_date"]["count"] == 1
+    assert stats["update"]["controls"] == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_typed_time_is_applied_or_reverted(page):
+    picker = mounted(page, hour_minute=True)
+    picker.hour_text.value = "18"
+    picker._set_hh_min(event(picker.hour_text, "submit"))
+    assert picker.hour == 18
+    click(cell(picker, 10))
+    assert picker.selected == [datetime(2023, 5, 10, 18, picker.minute)]
+    picker.minute_text.value = "75"
+    picker._set_hh_min(event(picker.minute_text, "blur"))
+    assert picker.minute_text.value == str(picker.minute)
+
+
+def test_delayed_updates_are_coalesced(page, conn):
+    picker = mounted(page, update_delay=10)
+    sent = len(conn.batches)
+    navigate(picker, DatePicker.NEXT_MONTH)
+    navigate(picker, DatePicker.NEXT_MONTH)
+    assert len(conn.batches) == sent
+    picker._scheduler.flush()
+    assert len(conn.batches) == sent + 1
+    assert picker.month_views[0].cells[10].data.month == 7
+
+
+def test_state_lives_in_the_engine(page):
+    picker = mounted(page)
+    navigate(picker, DatePicker.NEXT_MONTH)
+    assert (picker.engine.yy, picker.engine.mm) == (picker.yy, picker.mm) == (2023, 6)
+    click(cell(picker, 3))
+    assert picker.engine.selected == picker.selected == [datetime(2023, 6, 3)]
+
+
+def test_visible_month_is_rendered_when_its_availability_arrives(page):
+    # the fetch waits for the test to be listening
+    listening = threading.Event()
+    cache = AvailabilityCache(StaticAvailabilityProvider(lambda year, month: listening.wait(1) and [date(2023, 5, 10)]))
+    picker = mounted(page, availability=cache)
+    # the render is left pending on the scheduler and flushed here
+    picker.AVAILABILITY_RENDER_DELAY = 10
+    done = threading.Event()
+    cache.add_listener(lambda year, month: done.set())
+    listening.set()
+    assert done.wait(1)
+    assert not cell(picker, 10).disabled
+    picker._scheduler.flush()
+    assert cell(picker, 10).disabled
+    assert not cell(picker, 11).disabled
+    picker.will_unmount()
+    assert picker._on_availability_loaded not in cache._listeners
+
+
+def test_year_month_picker_jumps_once(page, conn):
+    picker = mounted(page)
+    cells = list(picker.month_views[0].cells)
+    picker._open_ym_picker(event(ft.Container(data=DatePicker.YEAR_PICKER)))
+    assert picker.ym_picker.visible and not picker.months_layout.visible
+    assert picker.ym_picker_title.value == "2020 - 2029"
+    year = next(c for c in picker.ym_picker_cells if c.data == 2027)
+    click(year)
+    assert picker.ym_picker_mode == DatePicker.MONTH_PICKER
+    sent = len(conn.batches)
+    click(picker.ym_picker_cells[1])
+    assert len(conn.batches) == sent + 1
+    assert (picker.yy, picker.mm) == (2027, 2)
+    assert not picker.ym_picker.visible and picker.months_layout.visible
+    assert picker.month_views[0].cells == cells
+
+
+def test_jump_to_in_scroll_mode_restarts_the_list(page):
+    picker = mounted(page, scroll_months=24)
+    picker._on_months_scroll(SimpleNamespace(pixels=10 * DatePicker.MONTH_EXTENT))
+    picker.jump_to(2030, 1)
+    assert sorted(v.index for v in picker.month_views) == [0, 1, 2, 3]
+    assert picker.scroll_header.month_text.value == "January"
+    assert picker.scroll_header.year_text.value == 2030
+
+
+def test_keyboard_focus_patches_two_cells(page, conn):
+    picker = mounted(page, keyboard=True, selected_date=[datetime(2023, 5, 10)])
+    assert page.on_keyboard_event.count() == 1
+    picker._on_keyboard(key("Arrow Right"))
+    assert picker.engine.focus == date(2023, 5, 10)
+    picker._on_keyboard(key("Arrow Down"))
+    assert picker.engine.focus == date(2023, 5, 17)
+    # the old and the new focused cell
+    assert [c.name for c in conn.last()] == ["set", "set"]
+    picker._on_keyboard(key("Enter"))
+    assert picker.selected == [datetime(2023, 5, 17)]
+
+
+def test_keyboard_focus_leaving_the_month_jumps(page):
+    picker = mounted(page, keyboard=True)
+    picker.engine.focus = date(2023, 5, 31)
+    picker._on_keyboard(key("Arrow Right"))
+    assert (picker.yy, picker.mm) == (2023, 6)
+    picker._on_keyboard(key("Page Down", shift=True))
+    assert (picker.yy, picker.mm) == (2024, 6)
+    picker.will_unmount()
+    assert page.on_keyboard_event.count() == 0
+
+
+def test_snapshot_restores_a_built_picker(page):
+    picker = mounted(page, selection_type=SelectionType.MULTIPLE, first_weekday=6)
+    click(cell(picker, 10))
+    click(cell(picker, 11))
+    navigate(picker, DatePicker.NEXT_MONTH)
+    other = mounted(page, selection_type=SelectionType.MULTIPLE)
+    other.restore(picker.snapshot())
+    assert other.selected == picker.selected
+    assert (other.yy, other.mm) == (2023, 6)
+    # the layout of a built picker is kept
+    assert other.first_weekday == 0
+    assert other.month_views[0].cells[0].data == datetime(2023, 5, 29)
+
+
+def test_selection_change_deltas(page):
+    changes = []
+    picker = mounted(page, selection_type=SelectionType.MULTIPLE, on_select_change=changes.append)
+    click(cell(picker, 10))
+    click(cell(picker, 11))
+    click(cell(picker, 10))
+    assert [(c.added, c.removed) for c in changes] == [
+        ((datetime(2023, 5, 10),), ()),
+        ((datetime(2023, 5, 11),), ()),
+        ((), (datetime(2023, 5, 10),)),
+    ]
+    assert changes[-1].selected == (datetime(2023, 5, 11),)
+
+
+def test_selection_changes_are_batched_with_a_delay(page):
+    changes = []
+    picker = mounted(page, selection_type=SelectionType.MULTIPLE, on_select_change=changes.append, change_delay=10)
+    click(cell(picker, 10))
+    click(cell(picker, 11))
+    click(cell(picker, 10))
+    assert changes == []
+    picker.flush_changes()
+    assert [(c.added, c.removed) for c in changes] == [((datetime(2023, 5, 11),), ())]
+
+
+def test_reconfigure_engine_options_patch_the_cells(page, conn):
+    picker = mounted(page)
+    cells = list(picker.month_views[0].cells)
+    picker.reconfigure(disable_from=datetime(2023, 5, 20))
+    assert picker.month_views[0].cells == cells
+    assert conn.last() and not conn.last("add")
+    assert cell(picker, 25).disabled and not cell(picker, 15).disabled
+
+
+def test_reconfigure_first_weekday_relabels(page, conn):
+    picker = mounted(page, locale="C")
+    cells = list(picker.month_views[0].cells)
+    picker.reconfigure(first_weekday=6)
+    assert [b.text for b in picker.month_views[0].labels][:2] == ["Su", "Mo"]
+    assert picker.month_views[0].cells == cells
+    assert picker.month_views[0].cells[0].data == datetime(2023, 4, 30)
+    assert not conn.last("add")
+
+
+def test_reconfigure_layout_options_rebuild(page, conn):
+    picker = mounted(page)
+    picker.reconfigure(show_three_months=True)
+    assert len(picker.month_views) == 3
+    assert conn.last("add")
+
+
+def test_reconfigure_rejects_unknown_options(page):
+    picker = mounted(page)
+    with pytest.raises(TypeError):
+        picker.reconfigure(colour="red")
+
+
+def test_reset_goes_back_to_the_defaults(page):
+    picker = mounted(page, selection_type=SelectionType.RANGE, hide_prev_next_month_days=True)
+    picker.reset(selected_date=[datetime(2023, 8, 2)])
+    assert picker.selection_type == SelectionType.SINGLE
+    assert not picker.hide_prev_next_month_days
+    assert (picker.yy, picker.mm) == (2023, 8)
+    assert picker.month_views[0].cells[0].data == datetime(2023, 7, 31)
+
+
+def test_decorators_patch_the_changed_cells(page, conn):
+    values = DayValues({date(2023, 5, 10): 3}, colors=("heat",))
+    picker = mounted(page, decorators=values)
+    view = picker.month_views[0]
+    idx = view.cells.index(cell(picker, 10))
+    assert cell(picker, 10).style.bgcolor == "heat"
+    assert view.badges[idx].value == "3"
+    # data changes re-render the picker, only the changed cell is patched
+    values.add({date(2023, 5, 11): 1})
+    assert view.badges[idx + 1].value == "1"
+    assert {c.name for c in conn.last()} == {"set"}
+    assert not conn.last("add")
+
+
+def test_decorators_toggle_rebuilds_the_cells(page):
+    picker = mounted(page)
+    assert not isinstance(cell(picker, 10).content, ft.Stack)
+    picker.reconfigure(decorators=DayValues({date(2023, 5, 10): 3}))
+    assert isinstance(cell(picker, 10).content, ft.Stack)
+    picker.will_unmount()
+    assert not picker.decorators[0]._listeners
+def test_availability_renders_only_for_months_in_the_grid(page):
+    picker = mounted(page, availability=StaticAvailabilityProvider([]))
+    picker.AVAILABILITY_RENDER_DELAY = 10
+    picker._on_availability_loaded(2023, 8)
+    assert not picker._scheduler._pending
+    # the may grid ends with the first days of june
+    picker._on_availability_loaded(2023, 6)
+    assert picker._scheduler._pending
+    picker._scheduler.cancel()
+
+
+def test_keys_are_ignored_while_editing_the_time_or_unmounted(page):
+    picker = mounted(page, keyboard=True, hour_minute=True)
+    picker._edit_hh_min(event(picker.hour_text, "focus"))
+    picker._on_keyboard(key("Arrow Right"))
+    assert picker.engine.focus is None
+    picker._set_hh_min(event(picker.hour_text, "blur"))
+    picker._on_keyboard(key("Arrow Right"))
+    assert picker.engine.focus is not None
+    picker.active = False
+    focus = picker.engine.focus
+    picker._on_keyboard(key("Arrow Right"))
+    assert picker.engine.focus == focus
+
+
+def test_reconfigure_tz_converts_the_bounds(page):
+    bound = datetime(2023, 5, 10, 2, tzinfo=timezone.utc)
+    picker = mounted(page, disable_to=bound)
+    picker.reconfigure(tz="America/New_York")
+    assert picker.engine._disable_to_day == date(2023, 5, 9)
+    assert not cell(picker, 9).disabled and cell(picker, 8).disabled
+
+
+def test_mounting_enables_key_events_on_the_client(page, conn):
+    mounted(page, keyboard=True)
+    sets = [c for batch in conn.batches for c in batch if c.name == "set" and c.values == ["page"]]
+    assert [c.attrs.get("onkeyboardevent") for c in sets] == ["true"]
+    # a second picker does not update the page again
+    mounted(page, keyboard=True)
+    assert page.on_keyboard_event.count() == 2
+    assert len([c for batch in conn.batches for c in batch if c.name == "set" and c.values == ["page"]]) == 1
+
+
+def test_delayed_selection_change_keeps_its_snapshot(page):
+    changes = []
+    picker = mounted(page, selection_type=SelectionType.MULTIPLE, on_select_change=changes.append, change_delay=10)
+    click(cell(picker, 10))
+    picker.flush_changes()
+    click(cell(picker, 11))
+    assert changes[0].selected == (datetime(2023, 5, 10),)
+
+
+def test_replacing_the_selection_delivers_the_pending_changes(page):
+    changes = []
+    picker = mounted(page, selection_type=SelectionType.MULTIPLE, on_select_change=changes.append, change_delay=10)
+    click(cell(picker, 10))
+    picker.reconfigure(selected_date=[datetime(2023, 5, 20)])
+    assert [(c.added, c.selected) for c in changes] == [((datetime(2023, 5, 10),), (datetime(2023, 5, 10),))]
+    picker.flush_changes()
+    assert len(changes) == 1
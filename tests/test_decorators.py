@@ -0,0 +1,45 @@
+from datetime import date
+
+from datepicker.decorators import DayValues, merge_annotations
+from datepicker.month_model import month_weeks
+
+
+def grid(year=2023, month=5):
+    return tuple(d for w in month_weeks(year, month, 0) for d in w)
+
+
+def test_points_and_thresholds():
+    days = grid()
+    values = DayValues({date(2023, 5, 1): 1, date(2023, 5, 2): 5}, colors=("low", "high"), thresholds=[2])
+    annotations = values.annotate(days)
+    assert annotations[0] == ("low", "1")
+    assert annotations[1] == ("high", "5")
+    assert annotations[2] is None
+    assert values.annotate(days) is annotations
+
+
+def test_columns_are_sliced_over_the_grid():
+    days = grid()
+    values = DayValues(list(range(1, 11)), start=date(2023, 5, 28), colors=("c",), badge=None)
+    annotations = values.annotate(days)
+    # may 28 is the 28th cell of the grid starting on may 1
+    assert annotations[26] is None
+    assert annotations[27:] == (("c", None),) * 8
+    assert values.value(date(2023, 6, 3)) == 7
+
+
+def test_data_changes_drop_the_cached_grids_and_notify():
+    days = grid()
+    values = DayValues({date(2023, 5, 1): 1})
+    first = values.annotate(days)
+    notified = []
+    values.add_listener(lambda: notified.append(values))
+    values.add({date(2023, 5, 3): 4})
+    assert notified == [values]
+    assert values.annotate(days) is not first
+    assert values.annotate(days)[2][1] == "4"
+
+
+def test_merge_annotations():
+    merged = merge_annotations([(("red", "1"), None, None), ((None, "a"), ("blue", None), None)])
+    assert merged == (("red", "1 · a"), ("blue", None), None)
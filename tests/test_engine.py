@@ -0,0 +1,222 @@
+import subprocess
+import sys
+from datetime import date, datetime, timezone
+
+from datepicker.changes import ChangeBatch
+from datepicker.engine import FOCUSED, HIDDEN, IN_RANGE, MAIN_MONTH, SELECTED, TODAY, CalendarEngine, days_in_month
+from datepicker.month_model import DISABLED, HOLIDAY, WEEKEND
+from datepicker.rules import HourWindow, Weekends
+from datepicker.selection_type import SelectionType
+
+
+def engine(**kwargs):
+    kwargs.setdefault("now", datetime(2023, 5, 15, 10, 30))
+    return CalendarEngine(**kwargs)
+
+
+def states(e, year, month, today=date(2023, 5, 15)):
+    state = e.month_state(year, month, today=today)
+    return dict(zip(state.days, state.states))
+
+
+def test_engine_does_not_import_flet():
+    code = "import sys, datepicker.engine; print('flet' in sys.modules)"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "False"
+
+
+def test_days_in_month():
+    assert days_in_month(2023, 2) == 28
+    assert days_in_month(2024, 2) == 29
+    assert days_in_month(1900, 2) == 28
+    assert days_in_month(2000, 2) == 29
+    assert days_in_month(2023, 12) == 31
+
+
+def test_step_month_and_year():
+    e = engine(now=datetime(2023, 12, 10))
+    e.step_month(1)
+    assert (e.yy, e.mm) == (2024, 1)
+    e.step_month(-2)
+    assert (e.yy, e.mm) == (2023, 11)
+    e.step_year(-1)
+    assert (e.yy, e.mm) == (2022, 11)
+
+
+def test_steps_never_skip_a_month():
+    e = engine(now=datetime(2023, 1, 31))
+    months = []
+    for _ in range(24):
+        e.step_month(1)
+        months.append(e.mm)
+    assert months == [m % 12 + 1 for m in range(1, 25)]
+
+
+def test_jump_to_clamps_the_day_without_drifting():
+    e = engine(now=datetime(2024, 1, 31))
+    e.jump_to(2024, 2)
+    assert e.now.day == 29
+    e.jump_to(2024, 3)
+    assert e.now.day == 29
+    e.jump_to(2030)
+    assert (e.yy, e.mm) == (2030, 3)
+
+
+def test_shift_month():
+    assert CalendarEngine.shift_month(2023, 1, -1) == (2022, 12)
+    assert CalendarEngine.shift_month(2023, 12, 1) == (2024, 1)
+    assert CalendarEngine.shift_month(2023, 5, -125) == (2012, 12)
+    assert CalendarEngine().prev_next_month(2023, 1) == ((2022, 12), (2023, 2))
+
+
+def test_month_state_flags():
+    e = engine(
+        holidays=[datetime(2023, 5, 1)],
+        disable_to=datetime(2023, 5, 3),
+        disable_from=datetime(2023, 5, 29),
+        selected_date=[datetime(2023, 5, 10)]
+    )
+    s = states(e, 2023, 5)
+    assert s[date(2023, 5, 1)] & HOLIDAY and s[date(2023, 5, 1)] & DISABLED
+    assert not s[date(2023, 5, 3)] & DISABLED
+    assert s[date(2023, 5, 30)] & DISABLED
+    assert s[date(2023, 5, 6)] & WEEKEND
+    assert s[date(2023, 5, 10)] & SELECTED
+    assert s[date(2023, 5, 15)] & TODAY
+    assert s[date(2023, 5, 15)] & MAIN_MONTH
+    assert not s[date(2023, 6, 1)] & MAIN_MONTH
+
+
+def test_hidden_days_of_other_months():
+    e = engine(hide_prev_next_month_days=True)
+    s = states(e, 2023, 5)
+    assert s[date(2023, 6, 1)] & HIDDEN
+    assert not s[date(2023, 5, 31)] & HIDDEN
+
+
+def test_range_states():
+    e = engine(selection_type=SelectionType.RANGE, selected_date=[datetime(2023, 5, 8), datetime(2023, 5, 12)])
+    s = states(e, 2023, 5)
+    assert s[date(2023, 5, 8)] & SELECTED
+    assert s[date(2023, 5, 10)] & IN_RANGE and not s[date(2023, 5, 10)] & SELECTED
+    assert not s[date(2023, 5, 13)] & (SELECTED | IN_RANGE)
+
+
+def test_holidays_invalidate_the_month_cache():
+    e = engine()
+    assert not states(e, 2023, 5)[date(2023, 5, 8)] & HOLIDAY
+    e.holidays = [date(2023, 5, 8)]
+    assert states(e, 2023, 5)[date(2023, 5, 8)] & HOLIDAY
+
+
+def test_first_weekday():
+    e = engine(first_weekday=6)
+    state = e.month_state(2023, 5)
+    assert state.days[0] == date(2023, 4, 30)
+    assert state.days[0].weekday() == 6
+
+
+def test_select_with_time():
+    e = engine(hour_minute=True)
+    e.set_time(8, 45)
+    assert e.select(datetime(2023, 5, 20))
+    assert e.selected == [datetime(2023, 5, 20, 8, 45)]
+    e.step_time(1, hours=True)
+    assert (e.hour, e.minute) == (9, 45)
+
+
+def test_disabled_rules():
+    e = engine(disabled_rules=Weekends())
+    assert e.is_disabled(datetime(2023, 5, 6))
+    assert not e.is_disabled(datetime(2023, 5, 8))
+    assert states(e, 2023, 5)[date(2023, 5, 6)] & DISABLED
+    e.disabled_rules = None
+    assert not e.is_disabled(datetime(2023, 5, 6))
+
+
+def test_time_dependent_rules_follow_the_time():
+    e = engine(hour_minute=True, disabled_rules=HourWindow({0: ("09:00", "17:00")}, default_open=False))
+    e.set_time(10, 0)
+    assert not e.is_disabled(datetime(2023, 5, 8))
+    assert e.is_disabled(datetime(2023, 5, 9))
+    e.set_time(18, 0)
+    assert e.is_disabled(datetime(2023, 5, 8))
+
+
+def test_date_only_engine_skips_the_time_dependent_rules():
+    rules = [HourWindow({0: ("09:00", "17:00")}, default_open=False), Weekends()]
+    e = engine(now=datetime(2023, 5, 15, 20, 0), disabled_rules=rules)
+    e.set_time(20, 0)
+    assert not e.is_disabled(datetime(2023, 5, 9))
+    assert e.is_disabled(datetime(2023, 5, 6))
+    e.hour_minute = True
+    assert e.is_disabled(datetime(2023, 5, 9))
+
+
+def test_move_focus():
+    e = engine(selected_date=[datetime(2023, 5, 10)])
+    assert e.move_focus(1) == date(2023, 5, 10)
+    assert e.move_focus(1) == date(2023, 5, 11)
+    assert e.move_focus(-7) == date(2023, 5, 4)
+    assert e.move_focus(months=1) == date(2023, 6, 4)
+    e.focus = date(2023, 1, 31)
+    assert e.move_focus(months=1) == date(2023, 2, 28)
+    e.jump_to(2023, 2)
+    assert states(e, 2023, 2)[date(2023, 2, 28)] & FOCUSED
+
+
+def test_set_selection_keeps_values():
+    e = engine(selection_type=SelectionType.MULTIPLE, selected_date=[datetime(2023, 5, 1), datetime(2023, 5, 2)])
+    e.set_selection(keep=True)
+    assert len(e.selection) == 2
+    e.set_selection(SelectionType.SINGLE, keep=True)
+    assert len(e.selection) == 0
+    e.set_selection(selected_date=[datetime(2023, 5, 3)])
+    assert e.selected == [datetime(2023, 5, 3)]
+
+
+def test_set_zone_matches_the_constructor():
+    utc = timezone.utc
+    options = dict(
+        disable_to=datetime(2024, 5, 10, 2, tzinfo=utc),
+        holidays=[datetime(2024, 5, 20, 1, tzinfo=utc)],
+        selected_date=[datetime(2024, 5, 15, 2, tzinfo=utc)],
+    )
+    e = engine(**options)
+    e.month_model(2024, 5)
+    assert e.set_zone("America/New_York")
+    expected = engine(tz="America/New_York", **options)
+    assert e._disable_to_day == expected._disable_to_day == date(2024, 5, 9)
+    assert list(e.holidays) == list(expected.holidays) == [date(2024, 5, 19)]
+    assert e.selected == expected.selected
+    assert e.now.tzinfo is e.zone
+
+
+def test_set_zone_unchanged_keeps_the_month_cache():
+    e = engine(tz="Europe/Berlin")
+    e.month_model(2023, 5)
+    assert not e.set_zone("Europe/Berlin")
+    assert len(e.month_models._models) == 1
+
+
+def test_take_changes_with_the_selection():
+    e = engine(selection_type=SelectionType.MULTIPLE, selected_date=[datetime(2023, 5, 1)])
+    e.changes = ChangeBatch()
+    e.select(datetime(2023, 5, 2))
+    added, removed, selected = e.take_changes()
+    assert list(added.values()) == [datetime(2023, 5, 2)] and not removed
+    assert selected == (datetime(2023, 5, 1), datetime(2023, 5, 2))
+    assert e.take_changes() == ({}, {}, ())
+
+
+def test_set_selection_flushes_the_pending_changes():
+    delivered = []
+    e = engine(selection_type=SelectionType.MULTIPLE)
+    e.changes = ChangeBatch(lambda: delivered.append(e.take_changes()))
+    e.set_selection(selected_date=[datetime(2023, 5, 1)])
+    assert delivered == []
+    e.select(datetime(2023, 5, 3))
+    e.set_selection(selected_date=[datetime(2023, 5, 4)])
+    assert [(list(added.values()), selected) for added, _, selected in delivered] == [
+        ([datetime(2023, 5, 3)], (datetime(2023, 5, 1), datetime(2023, 5, 3)))
+    ]
+    assert not e.changes
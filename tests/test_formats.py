@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+
+from datepicker.formats import DateFormat, get_format
+from datepicker.locale_names import LocaleNames
+
+NAMES = LocaleNames(
+    "test",
+    ("", "January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"),
+    ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+    ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"),
+    ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"),
+    "%d/%m/%Y",
+)
+
+
+def with_format(date_format):
+    return LocaleNames("test", NAMES.month_names, NAMES.month_abbr, NAMES.day_names, NAMES.day_abbr, date_format)
+
+
+def test_iso_with_time():
+    f = get_format("%Y-%m-%d %H:%M:%S")
+    assert f.has_time
+    assert f.parse("2023-05-01 10:20:30") == datetime(2023, 5, 1, 10, 20, 30)
+    assert f.parse(" 2023-5-1  10:20:30 ") == datetime(2023, 5, 1, 10, 20, 30)
+    assert f.format(datetime(2023, 5, 1, 10, 2, 3)) == "2023-05-01 10:02:03"
+    assert f.hint == "yyyy-mm-dd hh:mm:ss"
+
+
+def test_invalid_text():
+    f = get_format("%Y-%m-%d")
+    assert f.parse("2023-02-30") is None
+    assert f.parse("2023-13-01") is None
+    assert f.parse("01/02/2023") is None
+    assert f.parse("") is None
+    assert f.parse(None) is None
+
+
+def test_names():
+    f = get_format("%a %d %B %Y", NAMES)
+    assert f.parse("mon 1 MAY 2023") == datetime(2023, 5, 1)
+    assert f.format(datetime(2023, 5, 1)) == "Mon 01 May 2023"
+    assert get_format("%b %d", NAMES).parse("Sep 2") is None
+    with pytest.raises(ValueError):
+        DateFormat("%B %Y")
+
+
+def test_space_padded_day():
+    f = get_format("%e.%m.%Y")
+    assert f.format(datetime(2024, 3, 5)) == " 5.03.2024"
+    assert f.parse(" 5.03.2024") == datetime(2024, 3, 5)
+    assert f.parse("15.03.2024") == datetime(2024, 3, 15)
+
+
+def test_locale_pattern():
+    assert get_format(None, NAMES).pattern == "%d/%m/%Y"
+    assert get_format(None, NAMES, True).pattern == "%d/%m/%Y %H:%M"
+    assert get_format().pattern == "%Y-%m-%d"
+    assert get_format(None, NAMES) is get_format(None, NAMES)
+
+
+def test_unsupported_locale_pattern_falls_back_to_iso():
+    assert get_format(None, with_format("%Ey/%m/%d")).pattern == "%Y-%m-%d"
+    assert get_format(None, with_format("%Ey/%m/%d"), True).pattern == "%Y-%m-%d %H:%M"
+    with pytest.raises(ValueError):
+        get_format("%Ey/%m/%d")
+
+
+def test_literal_percent():
+    f = get_format("%Y%%%m")
+    assert f.format(datetime(2023, 5, 1)) == "2023%05"
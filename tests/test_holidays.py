@@ -0,0 +1,61 @@
+from datetime import date, datetime
+
+from datepicker.holidays import HolidayCalendar
+
+ICS = """BEGIN:VCALENDAR
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20231224
+DTEND;VALUE=DATE:20231227
+SUMMARY:Christmas\\, holidays
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20230101T230000Z
+SUMMARY:UTC
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20230301T100000
+DTEND:20230303T000000
+SUMMARY:Timed
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20230501
+RRULE:FREQ=YEARLY
+SUMMARY:Labour
+  day
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_calendar():
+    c = HolidayCalendar([datetime(2023, 4, 25), (date(2023, 6, 2), "Republic")])
+    c.add(date(2000, 12, 25), "Christmas", yearly=True)
+    assert datetime(2023, 4, 25, 10, 0) in c
+    assert c.label(date(2023, 6, 2)) == "Republic"
+    assert c.label(date(2031, 12, 25)) == "Christmas"
+    version = c.version
+    c.remove(date(2023, 4, 25))
+    assert date(2023, 4, 25) not in c and c.version > version
+
+
+def test_csv(tmp_path):
+    path = tmp_path / "holidays.csv"
+    path.write_text("date,name\n2023-04-25,Liberation\n2023-06-02,\n", encoding="utf-8")
+    c = HolidayCalendar.from_csv(path)
+    assert c.label(date(2023, 4, 25)) == "Liberation"
+    assert date(2023, 6, 2) in c and c.label(date(2023, 6, 2)) is None
+
+
+def test_ics(tmp_path):
+    path = tmp_path / "holidays.ics"
+    path.write_text(ICS, encoding="utf-8")
+    c = HolidayCalendar.from_ics(path, tz="Europe/Berlin")
+    # DTEND is exclusive, every day of the event is a holiday
+    assert [d for d in c if d.month == 12] == [date(2023, 12, 24), date(2023, 12, 25), date(2023, 12, 26)]
+    assert c.label(date(2023, 12, 25)) == "Christmas, holidays"
+    # 23:00 UTC is already the next day in Berlin
+    assert date(2023, 1, 2) in c and date(2023, 1, 1) not in c
+    # an event ending at midnight does not cover that day
+    assert date(2023, 3, 2) in c and date(2023, 3, 3) not in c
+    assert c.label(date(2030, 5, 1)) == "Labour day"
+    assert date(2023, 1, 1) in HolidayCalendar.from_ics(path, tz="UTC")
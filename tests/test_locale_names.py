@@ -0,0 +1,22 @@
+import locale as loc
+
+import pytest
+
+from datepicker.locale_names import get_locale_names
+
+
+def test_names_are_cached():
+    names = get_locale_names("C")
+    assert get_locale_names("C") is names
+    assert names.month_names[5] == "May"
+    assert names.weekday_labels() == ("Mo", "Tu", "We", "Th", "Fr", "Sa", "Su")
+    assert names.weekday_labels(6)[0] == "Su"
+
+
+def test_unknown_locale():
+    with pytest.raises(loc.Error):
+        get_locale_names("xx_XX")
+
+
+def test_c_locale_uses_the_iso_pattern():
+    assert get_locale_names("C").date_format == "%Y-%m-%d"
@@ -0,0 +1,36 @@
+import logging
+
+from datepicker.metrics import CallbackMetrics, InMemoryMetrics, LoggingMetrics, as_collector
+
+
+def test_in_memory_stats():
+    metrics = InMemoryMetrics()
+    metrics.record("select_date", 0.002, 3)
+    metrics.record("select_date", 0.004, 1)
+    with metrics.timer("build", lambda: 7):
+        pass
+    summary = metrics.summary()
+    assert summary["select_date"]["count"] == 2
+    assert summary["select_date"]["mean_ms"] == 3.0
+    assert summary["select_date"]["max_ms"] == 4.0
+    assert summary["select_date"]["controls"] == 4
+    assert summary["build"]["controls"] == 7
+    metrics.reset()
+    assert metrics.summary() == {}
+
+
+def test_as_collector():
+    records = []
+    collector = as_collector(lambda *args: records.append(args))
+    assert isinstance(collector, CallbackMetrics)
+    collector.record("update", 0.1, 2)
+    assert records == [("update", 0.1, 2)]
+    metrics = InMemoryMetrics()
+    assert as_collector(metrics) is metrics
+    assert as_collector(None) is None
+
+
+def test_logging_metrics(caplog):
+    with caplog.at_level(logging.DEBUG, logger="datepicker"):
+        LoggingMetrics().record("update", 0.0015, 4)
+    assert caplog.messages == ["update took 1.500 ms (4 controls)"]
@@ -0,0 +1,32 @@
+from datetime import date
+
+from datepicker.month_model import HOLIDAY, WEEKEND, MonthModel, MonthModelCache, month_weeks
+
+
+def flags(d):
+    return (WEEKEND if d.weekday() >= 5 else 0) | (HOLIDAY if d == date(2023, 5, 1) else 0)
+
+
+def test_model_flags():
+    model = MonthModel(2023, 5, 0, flags)
+    assert model.weeks_number == 5
+    assert model.days[0] == date(2023, 5, 1)
+    assert model.flags[0] == HOLIDAY
+    assert model.flags[model.days.index(date(2023, 5, 6))] == WEEKEND
+
+
+def test_weeks_are_shared():
+    assert MonthModel(2023, 5, 0, flags).weeks is month_weeks(2023, 5, 0)
+    assert month_weeks(2023, 5, 6)[0][0] == date(2023, 4, 30)
+
+
+def test_cache_is_keyed_by_version_and_lru():
+    cache = MonthModelCache(maxsize=2)
+    model = cache.get(2023, 5, 0, 0, flags)
+    assert cache.get(2023, 5, 0, 0, flags) is model
+    assert cache.get(2023, 5, 0, 1, flags) is not model
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.get(2023, 6, 0, 0, flags)
+    # the least recently used version 0 model was evicted
+    cache.get(2023, 5, 0, 0, flags)
+    assert cache.misses == 4
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+import pytest
+
+import datepicker
+
+
+def test_package_import_is_lazy():
+    code = "import sys, datepicker; print(sorted(m for m in ('flet', 'calendar', 'datepicker.datepicker') if m in sys.modules))"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "[]"
+
+
+def test_exports():
+    from datepicker.datepicker import DatePicker
+    assert datepicker.DatePicker is DatePicker
+    assert "HolidayCalendar" in dir(datepicker)
+    with pytest.raises(AttributeError):
+        datepicker.Missing
+
+
+def test_picker_defers_its_engine():
+    picker = datepicker.DatePicker(selected_date=[])
+    assert picker._engine is None
+    assert picker.engine.selected == []
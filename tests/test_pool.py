@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import flet as ft
+
+from datepicker.pool import DatePickerPool
+from datepicker.selection_type import SelectionType
+from tests.conftest import RecordingConnection
+
+
+def test_pool_is_per_page(page):
+    pool = DatePickerPool.for_page(page, size=2)
+    assert DatePickerPool.for_page(page) is pool
+    assert DatePickerPool.for_page(ft.Page(RecordingConnection(), "other")) is not pool
+
+
+def test_released_pickers_are_reset_on_acquire(page):
+    pool = DatePickerPool(selection_type=SelectionType.MULTIPLE)
+    picker = pool.acquire(selected_date=[datetime(2023, 5, 10)])
+    page.add(picker)
+    picker.reconfigure(first_weekday=6)
+    pool.release(picker)
+    pool.release(picker)
+    assert len(pool) == 1
+
+    again = pool.acquire(selected_date=[datetime(2024, 2, 3)])
+    assert again is picker and pool.created == 1
+    assert again.selection_type == SelectionType.MULTIPLE
+    assert again.first_weekday == 0
+    assert again.selected == [datetime(2024, 2, 3)]
+    assert (again.yy, again.mm) == (2024, 2)
+    assert again.month_views[0].cells[0].data == datetime(2024, 1, 29)
+    assert pool.acquire() is not picker and pool.created == 2
+
+
+def test_released_pickers_ignore_the_keyboard(page):
+    pool = DatePickerPool(keyboard=True)
+    picker = pool.acquire()
+    page.add(picker)
+    pool.release(picker)
+    assert not picker.active
+    assert pool.acquire() is picker and picker.active
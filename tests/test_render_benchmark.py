@@ -0,0 +1,13 @@
+import json
+
+from benchmarks.render_benchmark import main
+
+
+def test_counts_only_report_is_its_own_baseline(tmp_path, capsys):
+    path = tmp_path / "bench.json"
+    assert main(["--repeat", "0", "--config", "single_month", "--json", str(path)]) == 0
+    report = json.loads(path.read_text())
+    assert "time_ms" not in report["single_month"]["select_date"]
+    assert report["single_month"]["next_month"]["controls_created"] == 0
+    assert main(["--repeat", "1", "--config", "single_month", "--baseline", str(path)]) == 0
+    assert "REGRESSION" not in capsys.readouterr().out
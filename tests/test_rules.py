@@ -0,0 +1,78 @@
+from datetime import date
+
+from datepicker.month_model import month_weeks
+from datepicker.rules import After, Before, Dates, HourWindow, NthWeekday, Only, Weekdays, Weekends, compile_rules, date_only
+
+
+def grid(year=2023, month=5, first_weekday=0):
+    return tuple(d for w in month_weeks(year, month, first_weekday) for d in w)
+
+
+def matching(rule, days, hour=0, minute=0):
+    mask = rule.mask(days, hour, minute)
+    return [d for i, d in enumerate(days) if mask >> i & 1]
+
+
+def test_weekdays_whole_weeks_and_partial():
+    days = grid()
+    assert all(d.weekday() in (5, 6) for d in matching(Weekends(), days))
+    assert len(matching(Weekends(), days)) == 10
+    # a grid not made of whole weeks goes through the per-day path
+    assert matching(Weekdays(0), days[2:9]) == [date(2023, 5, 8)]
+
+
+def test_nth_weekday():
+    days = grid()
+    # first and third monday of may 2023
+    assert [d for d in matching(NthWeekday(0, 1, 3), days) if d.month == 5] == [date(2023, 5, 1), date(2023, 5, 15)]
+
+
+def test_nth_weekday_from_the_end():
+    days = grid()
+    may = lambda rule: [d for d in matching(rule, days) if d.month == 5]
+    # may 2023 ends on a wednesday: last wednesday is the 31st, last friday the 26th
+    assert may(NthWeekday(2, -1)) == [date(2023, 5, 31)]
+    assert may(NthWeekday(4, -1)) == [date(2023, 5, 26)]
+    assert may(NthWeekday(4, -2)) == [date(2023, 5, 19)]
+    # the days of the adjacent months are checked against their own month
+    assert matching(NthWeekday(0, -1), grid(2023, 6)) == [date(2023, 5, 29), date(2023, 6, 26)]
+
+
+def test_dates_before_after():
+    days = grid()
+    assert matching(Dates([date(2023, 5, 3)]), days) == [date(2023, 5, 3)]
+    assert matching(Before(date(2023, 5, 2)), days) == [date(2023, 5, 1)]
+    assert matching(After(date(2023, 6, 3)), days) == [date(2023, 6, 4)]
+
+
+def test_combinators():
+    days = grid()
+    only = Only(NthWeekday(0, 1))
+    assert date(2023, 5, 1) not in matching(only, days)
+    assert len(matching(only, days)) == len(days) - 1
+    either = Dates([date(2023, 5, 3)]) | Before(date(2023, 5, 2))
+    assert matching(either, days) == [date(2023, 5, 1), date(2023, 5, 3)]
+    assert compile_rules(None) is None
+    assert matching(compile_rules([Before(date(2023, 5, 2)), After(date(2023, 6, 3))]), days) == [date(2023, 5, 1), date(2023, 6, 4)]
+
+
+def test_hour_window():
+    days = grid()
+    rule = HourWindow({0: ("09:00", "17:00")}, default_open=False)
+    assert rule.time_dependent and (~rule).time_dependent
+    open_monday = matching(rule, days, 10, 0)
+    assert all(d.weekday() != 0 for d in open_monday)
+    assert len(matching(rule, days, 18, 0)) == len(days)
+    assert matching(HourWindow({5: ((8, 0), (12, 0))}), days, 10, 0) == []
+
+
+def test_date_only_drops_the_time_dependent_rules():
+    days = grid()
+    window = HourWindow({0: ("09:00", "17:00")}, default_open=False)
+    assert date_only(window) is None
+    assert date_only(~window) is None
+    rule = date_only(compile_rules([window, Dates([date(2023, 5, 3)])]))
+    assert not rule.time_dependent
+    assert matching(rule, days, 20, 0) == [date(2023, 5, 3)]
+    weekends = Weekends()
+    assert date_only(weekends) is weekends
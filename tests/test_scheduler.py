@@ -0,0 +1,54 @@
+import threading
+
+from datepicker.scheduler import UpdateScheduler
+
+
+def test_immediate_render():
+    renders = []
+    scheduler = UpdateScheduler(lambda: renders.append(1))
+    scheduler.request()
+    scheduler.request()
+    assert len(renders) == 2
+
+
+def test_requests_during_a_render_are_coalesced():
+    renders = []
+
+    def render():
+        renders.append(1)
+        if len(renders) == 1:
+            scheduler.request()
+            scheduler.request()
+
+    scheduler = UpdateScheduler(render)
+    scheduler.request()
+    assert len(renders) == 2
+    assert scheduler.requests == 3
+
+
+def test_delayed_requests_are_coalesced():
+    done = threading.Event()
+    renders = []
+
+    def render():
+        renders.append(threading.current_thread())
+        done.set()
+
+    scheduler = UpdateScheduler(render, delay=0.01)
+    for _ in range(5):
+        scheduler.request()
+    assert done.wait(1)
+    assert len(renders) == 1
+    assert renders[0] is not threading.current_thread()
+
+
+def test_flush_and_cancel():
+    renders = []
+    scheduler = UpdateScheduler(lambda: renders.append(1), delay=10)
+    scheduler.request()
+    scheduler.flush()
+    assert len(renders) == 1
+    scheduler.request()
+    scheduler.cancel()
+    scheduler.flush()
+    assert len(renders) == 1
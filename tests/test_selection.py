@@ -0,0 +1,123 @@
+import threading
+from datetime import date, datetime
+
+from datepicker.changes import ChangeBatch, SelectionChange
+from datepicker.selection import MultipleSelection, RangeSelection, Selection, SingleSelection
+from datepicker.selection_type import SelectionType
+
+
+def d(day, month=5):
+    return datetime(2023, month, day)
+
+
+def test_create():
+    assert isinstance(Selection.create(SelectionType.SINGLE), SingleSelection)
+    assert isinstance(Selection.create(SelectionType.MULTIPLE), MultipleSelection)
+    assert isinstance(Selection.create(SelectionType.RANGE), RangeSelection)
+
+
+def test_single_toggles_and_replaces():
+    s = SingleSelection()
+    s.select(d(1))
+    s.select(d(2))
+    assert s.values() == [d(2)]
+    s.select(d(2))
+    assert len(s) == 0
+
+
+def test_multiple_is_keyed_by_day():
+    s = MultipleSelection([d(1), d(3)])
+    assert date(2023, 5, 1) in s
+    assert datetime(2023, 5, 3, 12, 0) in s
+    s.select(datetime(2023, 5, 1, 8, 0))
+    assert s.values() == [d(3)]
+
+
+def test_range_pending_and_end():
+    s = RangeSelection()
+    s.select(d(10))
+    assert s.pending == d(10)
+    assert not s.select(d(5))
+    assert s.select(d(15))
+    assert s.pending is None
+    assert s.ranges() == [(d(10), d(15))]
+    assert s.is_inside(d(12)) and not s.is_inside(d(10))
+    assert s.is_endpoint(d(15))
+    assert d(16) not in s
+
+
+def test_range_pending_start_is_cancelled():
+    s = RangeSelection()
+    s.select(d(10))
+    s.select(d(10))
+    assert s.pending is None and len(s) == 0
+
+
+def test_single_range_is_replaced():
+    s = RangeSelection([d(1), d(5)])
+    s.select(d(20))
+    assert s.ranges() == [] and s.pending == d(20)
+
+
+def test_multiple_ranges():
+    s = RangeSelection([d(1), d(5), d(20), d(25)], multiple_ranges=True)
+    assert s.ranges() == [(d(1), d(5)), (d(20), d(25))]
+    assert s.range_index(d(22)) == 1
+    assert s.overlaps(d(4), d(10))
+    # a range overlapping another one is refused
+    s.select(d(10))
+    assert not s.select(d(21))
+    assert s.select(d(12))
+    assert s.ranges() == [(d(1), d(5)), (d(10), d(12)), (d(20), d(25))]
+    # a click inside a range removes it
+    s.select(d(3))
+    assert s.ranges() == [(d(10), d(12)), (d(20), d(25))]
+
+
+
+def test_changes_are_recorded():
+    s = MultipleSelection([d(1)])
+    s.changes = ChangeBatch()
+    s.select(d(2))
+    s.select(d(1))
+    added, removed = s.changes.take()
+    assert list(added.values()) == [d(2)]
+    assert list(removed.values()) == [d(1)]
+    assert not s.changes
+
+
+def test_changes_cancel_out():
+    batch = ChangeBatch()
+    s = SingleSelection([d(1)])
+    s.changes = batch
+    s.select(d(2))
+    s.select(d(1))
+    added, removed = batch.take()
+    assert not added and not removed
+
+
+def test_selection_change_is_a_snapshot():
+    s = MultipleSelection([d(3), d(1)])
+    change = SelectionChange({date(2023, 5, 3): d(3), date(2023, 5, 1): d(1)}, {}, s.snapshot())
+    assert change.added == (d(1), d(3))
+    s.select(d(5))
+    assert change.selected == (d(3), d(1))
+
+
+def test_snapshots_from_another_thread_see_whole_changes():
+    s = RangeSelection(multiple_ranges=True)
+    errors = []
+
+    def read():
+        for _ in range(2000):
+            try:
+                s.snapshot()
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(2000):
+        s.select(d(1 + i % 28))
+    reader.join()
+    assert errors == []
@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from datepicker.engine import CalendarEngine
+from datepicker.selection_type import SelectionType
+from datepicker.state import STATE_VERSION, StateStore, decode_repeats, decode_runs, dumps, encode_repeats, encode_runs, encode_state, loads, restore_state
+
+
+def test_runs_round_trip():
+    ordinals = [1, 2, 3, 7, 8, 20]
+    runs = encode_runs(ordinals)
+    assert runs == [1, 3, 3, 2, 11, 1]
+    assert decode_runs(runs) == ordinals
+    assert encode_runs([]) == [] and decode_runs([]) == []
+
+
+def test_repeats_round_trip():
+    values = [570, 570, 570, 870, 870, 570]
+    assert encode_repeats(values) == [570, 3, 870, 2, 570, 1]
+    assert decode_repeats(encode_repeats(values)) == values
+
+
+def test_consecutive_days_are_compressed():
+    days = [datetime(2023, 1, 1) + timedelta(days=i) for i in range(365)]
+    e = CalendarEngine(selection_type=SelectionType.MULTIPLE, selected_date=days)
+    assert encode_state(e)["s"] == [days[0].toordinal(), 365]
+
+
+def test_times_are_run_length_encoded():
+    days = [datetime(2023, 1, 1 + i, 9 if i < 20 else 14, 30) for i in range(30)]
+    e = CalendarEngine(selection_type=SelectionType.MULTIPLE, selected_date=days, hour_minute=True)
+    state = encode_state(e)
+    assert state["m"] == [570, 20, 870, 10]
+    restored = CalendarEngine()
+    loads(restored, dumps(e))
+    assert restored.selected == days
+
+
+def test_single_time_is_one_value():
+    e = CalendarEngine(selected_date=[datetime(2023, 1, 5, 8, 15)], hour_minute=True)
+    assert encode_state(e)["m"] == 495
+
+
+def test_range_with_pending_start():
+    e = CalendarEngine(
+        selection_type=SelectionType.RANGE,
+        selected_date=[datetime(2023, 1, 1), datetime(2023, 1, 5), datetime(2023, 2, 1), datetime(2023, 2, 3), datetime(2023, 3, 1)],
+        multiple_ranges=True
+    )
+    restored = CalendarEngine()
+    loads(restored, dumps(e))
+    assert restored.selection.ranges() == e.selection.ranges()
+    assert restored.selection.pending == datetime(2023, 3, 1)
+
+
+def test_layout_options_can_be_skipped():
+    e = CalendarEngine(first_weekday=6, hour_minute=True)
+    restored = CalendarEngine()
+    loads(restored, dumps(e), options=False)
+    assert restored.first_weekday == 0 and not restored.hour_minute
+    loads(restored, dumps(e))
+    assert restored.first_weekday == 6 and restored.hour_minute
+
+
+def test_version_1_is_restored():
+    days = [datetime(2023, 1, 1, 1), datetime(2023, 1, 2, 2)]
+    e = CalendarEngine(selection_type=SelectionType.MULTIPLE, selected_date=days, hour_minute=True)
+    state = json.loads(dumps(e))
+    state["v"] = 1
+    state["m"] = [60, 120]
+    restored = CalendarEngine()
+    restore_state(restored, state)
+    assert restored.selected == days
+
+
+def test_unsupported_version():
+    state = json.loads(dumps(CalendarEngine()))
+    state["v"] = STATE_VERSION + 1
+    with pytest.raises(ValueError):
+        restore_state(CalendarEngine(), state)
+
+
+def test_store(tmp_path):
+    e = CalendarEngine(selected_date=[datetime(2023, 1, 5)])
+    restored = CalendarEngine()
+    with StateStore(str(tmp_path / "state")) as store:
+        store.save("session", dumps(e))
+        loads(restored, store.load("session"))
+        assert store.load("missing") is None
+        store.delete("session")
+        assert store.load("session") is None
+    assert restored.selected == e.selected
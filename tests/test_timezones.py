@@ -0,0 +1,55 @@
+from datetime import date, datetime, timedelta, timezone
+
+from datepicker.engine import CalendarEngine
+from datepicker.timezones import get_zone, month_offsets, to_zone
+
+NEW_YORK = get_zone("America/New_York")
+
+
+def test_transition_days():
+    assert month_offsets(NEW_YORK, 2023, 3).transitions == {12}
+    assert month_offsets(NEW_YORK, 2023, 11).transitions == {5}
+    assert month_offsets(NEW_YORK, 2023, 5).transitions == frozenset()
+    assert month_offsets(get_zone("UTC"), 2023, 3).transitions == frozenset()
+
+
+def test_gap_is_moved_forward():
+    value = month_offsets(NEW_YORK, 2023, 3).local(12, 2, 30)
+    assert (value.hour, value.minute) == (3, 30)
+    assert value.utcoffset() == timedelta(hours=-4)
+
+
+def test_overlap_keeps_the_first_occurrence():
+    value = month_offsets(NEW_YORK, 2023, 11).local(5, 1, 30)
+    assert (value.hour, value.minute) == (1, 30)
+    assert value.utcoffset() == timedelta(hours=-4)
+
+
+def test_other_days_keep_the_wall_time():
+    value = month_offsets(NEW_YORK, 2023, 3).local(13, 2, 30)
+    assert (value.day, value.hour, value.minute) == (13, 2, 30)
+    assert value.utcoffset() == timedelta(hours=-4)
+
+
+def test_to_zone():
+    naive = datetime(2023, 5, 1, 1, 0)
+    assert to_zone(naive, NEW_YORK) == naive.replace(tzinfo=NEW_YORK)
+    aware = datetime(2023, 5, 1, 1, 0, tzinfo=timezone.utc)
+    assert to_zone(aware, NEW_YORK).day == 30
+    assert to_zone(date(2023, 5, 1), NEW_YORK) == date(2023, 5, 1)
+
+
+def test_engine_cell_values_are_zone_aware():
+    e = CalendarEngine(tz="America/New_York", hour_minute=True, now=datetime(2023, 3, 12, 2, 30))
+    value = e.cell_value(date(2023, 3, 12))
+    assert value.tzinfo is NEW_YORK and value.hour == 3
+    assert e.select(datetime(2023, 3, 12, 7, 30, tzinfo=timezone.utc))
+    assert e.selected[0].utcoffset() == timedelta(hours=-4)
+
+
+def test_engine_days_are_taken_in_the_zone():
+    utc = timezone.utc
+    e = CalendarEngine(tz="America/New_York", disable_to=datetime(2024, 5, 10, 2, tzinfo=utc))
+    assert e._disable_to_day == date(2024, 5, 9)
+    assert e.day(datetime(2024, 5, 10, 2, tzinfo=utc)) == date(2024, 5, 9)
+    assert e.now.tzinfo is NEW_YORK